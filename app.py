@@ -1,11 +1,28 @@
-from fastapi import FastAPI, HTTPException
-from contextlib import asynccontextmanager
+from fastapi import Body, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager, nullcontext
+from typing import Literal
+import copy
+import os
+import queue
+import threading
+import time
 
-from bucket import create_buckets
 from student import Student, load_student_csv
-from section import Section, export_sections_to_csv
-from teacher import Teacher, load_teachers_csv, generate_teacher_dataframe
-from constants import TIME_BLOCKS
+from section import Section
+from editlog import EditLog, apply_edit, restore_sections
+from export import iter_csv_chunks
+from ingest import BulkUpsert, RosterJournal, iter_line_chunks
+from export_jobs import EXPORT_KINDS, ExportJobs
+from scenario import Scenario, compare, run_scenario
+from progress import ProgressFeed, sse
+from snapshot import ScheduleSnapshot, SnapshotBuilder, SnapshotHistory, load_snapshot, save_snapshot
+from tenant import Tenant, TenantConfig, TenantRegistry
+from teacher import Teacher, load_teachers_csv
+from scheduler import assign_buckets, run_pipeline
+from profiling import profile, profiling_enabled, list_profiles, profile_path
+import metrics
 
 # -------------------------------------------------
 # In-memory application state
@@ -15,158 +32,124 @@ students: dict[str, Student] = {}
 teachers: dict[str, Teacher] = {}
 sections: dict[str, Section] = {}
 
-# -------------------------------------------------
-# Scheduling logic (unchanged)
-# -------------------------------------------------
-
-def build_conflict_graph(
-    sections_list: list[Section],
-    students_list: list[Student],
-    teachers_list: list[Teacher]
-) -> dict[Section, set[Section]]:
-    conflicts = {s: set() for s in sections_list}
-
-    # Student conflicts
-    for student in students_list:
-        sched = student.get_schedule()
-        for i in range(len(sched)):
-            for j in range(i + 1, len(sched)):
-                s1, s2 = sched[i], sched[j]
-                conflicts[s1].add(s2)
-                conflicts[s2].add(s1)
-
-    # Teacher conflicts
-    for teacher in teachers_list:
-        sched = teacher.schedule
-        for i in range(len(sched)):
-            for j in range(i + 1, len(sched)):
-                s1, s2 = sched[i], sched[j]
-                conflicts[s1].add(s2)
-                conflicts[s2].add(s1)
-
-    return conflicts
-
-
-def assign_time_blocks(
-    sections_list: list[Section],
-    students_list: list[Student],
-    teachers_list: list[Teacher]
-) -> None:
-    conflicts = build_conflict_graph(sections_list, students_list, teachers_list)
-
-    ordered = sorted(
-        sections_list,
-        key=lambda s: len(conflicts[s]),
-        reverse=True
-    )
-
-    for section in ordered:
-        used_blocks = {
-            neighbor.get_time()
-            for neighbor in conflicts[section]
-            if neighbor.get_time() is not None
-        }
-
-        for block in TIME_BLOCKS:
-            if block not in used_blocks:
-                section.set_time(block)
-                break
-        else:
-            raise RuntimeError(f"Could not assign time block to {section}")
-
-
-def check_for_conflicts(
-    students_list: list[Student],
-    teachers_list: list[Teacher]
-) -> list[str]:
-    issues = []
-
-    for student in students_list:
-        seen = {}
-        for sec in student.get_schedule():
-            t = sec.get_time()
-            if t in seen:
-                issues.append(f"Student conflict: {student}")
-            seen[t] = sec
-
-    for teacher in teachers_list:
-        seen = {}
-        for sec in teacher.schedule:
-            t = sec.get_time()
-            if t in seen:
-                issues.append(f"Teacher conflict: {teacher}")
-            seen[t] = sec
+# Latest published schedule; replaced (never mutated) on every run
+snapshot: ScheduleSnapshot | None = None
+# Recent snapshots, for GET /changes
+history = SnapshotHistory(int(os.environ.get("SCHEDULER_SNAPSHOT_HISTORY", "10")))
+export_jobs = ExportJobs()
+# Manual edits since the persisted snapshot; opened at startup
+edit_log: EditLog | None = None
+# Students uploaded through POST /students:bulk; opened at startup
+roster_journal: RosterJournal | None = None
+# edit_seq of the snapshot last written to SNAPSHOT_PATH
+persisted_seq = 0
+# Rendered pieces of the live schedule, so an edit only re-renders what it touched
+builder: SnapshotBuilder | None = None
+
+SNAPSHOT_PATH = os.environ.get("SCHEDULER_SNAPSHOT_PATH", "out/snapshot.json")
+EDIT_LOG_PATH = os.environ.get("SCHEDULER_EDIT_LOG_PATH", "out/edits.log")
+ROSTER_JOURNAL_PATH = os.environ.get("SCHEDULER_ROSTER_JOURNAL_PATH", "out/roster.ndjson")
+# Persist the snapshot (and compact the edit log) after this many edits
+SNAPSHOT_EVERY = int(os.environ.get("SCHEDULER_SNAPSHOT_EVERY", "100"))
+# Rooms available per time block; unset for no limit
+BLOCK_CAPACITY = int(os.environ["SCHEDULER_BLOCK_CAPACITY"]) if os.environ.get("SCHEDULER_BLOCK_CAPACITY") else None
+
+tenants = TenantRegistry(
+    os.environ.get("SCHEDULER_TENANT_DIR", "out/tenants"),
+    int(os.environ.get("SCHEDULER_TENANT_MEMORY_MB", "512")) * 1024 * 1024
+)
 
-    return issues
+# (snapshot version, summary) of the live configuration, for POST /scenarios
+scenario_baseline: tuple[int, dict] | None = None
 
+# Set once this process has published a schedule of its own
+ready = threading.Event()
+scheduler_lock = threading.Lock()
+# Stage and conflict progress of scheduler runs, for GET /schedule/stream
+progress_feed = ProgressFeed(int(os.environ.get("SCHEDULER_PROGRESS_QUEUE", "256")))
 
 # -------------------------------------------------
 # Scheduler entrypoint
 # -------------------------------------------------
 
 def run_scheduler() -> list[str]:
-    global sections
-    sections.clear()
-
-    students_list = list(students.values())
-    teachers_list = list(teachers.values())
-
-    # Reset schedules (important if re-running)
-    for s in students_list:
-        s.schedule.clear()
-    for t in teachers_list:
-        t.schedule.clear()
-
-    buckets, _ = create_buckets()
-
-    # Create sections + assign students
-    for bucket in buckets:
-        bucket.assign_students(students_list)
-        needed = bucket.get_sections_needed()
-
-        for i in range(needed):
-            section = Section(bucket.subject, bucket.level)
-
-            per_section = len(bucket.get_students()) // needed
-            start = i * per_section
-            end = start + per_section if i < needed - 1 else len(bucket.get_students())
-
-            for student in bucket.get_students()[start:end]:
-                section.add_student(student)
-                student.add_section(section)
-
-            sections[str(section.get_id())] = section
-
-    # Assign teachers
-    df = generate_teacher_dataframe(teachers_list)
-
-    for section in sections.values():
-        subject = section.get_subject().capitalize()
-
-        preferred = df[df[subject] == 1]
-        fallback = df[df[subject] == 0]
-        pool = preferred if not preferred.empty else fallback
-
-        if pool.empty:
-            continue
-
-        pool = pool.copy()
-        pool["assigned"] = pool["Name"].apply(
-            lambda n: len(next(t for t in teachers_list if t.name == n).schedule)
+    """Schedules from scratch, replacing any manual edits."""
+    global sections, snapshot, persisted_seq, builder
+
+    with scheduler_lock:
+        try:
+            sections.clear()
+
+            with profile("run_scheduler") if profiling_enabled() else nullcontext():
+                sections_list, issues = run_pipeline(
+                    list(students.values()),
+                    list(teachers.values()),
+                    block_capacity=BLOCK_CAPACITY,
+                    progress=progress_feed.publish
+                )
+
+            for section in sections_list:
+                sections[str(section.get_id())] = section
+
+            conflicts = issues.all()
+            builder = SnapshotBuilder(sections_list, list(teachers.values()), list(students.values()), conflicts)
+            snapshot = builder.build(snapshot.version + 1 if snapshot else 1, edit_log.last_seq)
+            save_snapshot(snapshot, SNAPSHOT_PATH)
+            edit_log.compact(snapshot.edit_seq)
+            persisted_seq = snapshot.edit_seq
+            history.add(snapshot)
+            ready.set()
+        except Exception as e:
+            progress_feed.publish({"event": "error", "detail": str(e)})
+            raise
+
+        progress_feed.publish({"event": "done", "version": snapshot.version, "issues": len(conflicts)})
+        return conflicts
+
+
+def current_snapshot() -> ScheduleSnapshot:
+    """Returns the schedule to serve, or raises 503 until one exists."""
+    current = snapshot
+    if current is None:
+        raise HTTPException(
+            status_code=503,
+            detail="No schedule has been published yet",
+            headers={"Retry-After": "5"}
         )
-        pool = pool.sort_values("assigned")
-
-        for _, row in pool.iterrows():
-            teacher = next(t for t in teachers_list if t.name == row["Name"])
-            try:
-                teacher.add_section(section)
-                section.set_teacher(teacher)
-                break
-            except Exception:
-                continue
+    return current
+
+
+def recover(persisted: ScheduleSnapshot) -> bool:
+    """
+    Rebuilds the live schedule from the persisted snapshot and replays
+    the edits logged after it. False if the roster no longer matches it.
+    """
+    global snapshot, persisted_seq, builder
+    try:
+        sections.update(restore_sections(persisted, students, teachers))
+    except (KeyError, ValueError, IndexError) as e:
+        print(f"[Startup] Persisted schedule does not match the roster ({e}), rescheduling")
+        sections.clear()
+        return False
+
+    builder = SnapshotBuilder(
+        list(sections.values()), list(teachers.values()), list(students.values()), list(persisted.conflicts)
+    )
+    tail = edit_log.entries(persisted.edit_seq)
+    for entry in tail:
+        try:
+            section, touched_students, touched_teachers = apply_edit(entry, students, teachers, sections)
+        except (KeyError, ValueError, IndexError) as e:
+            print(f"[Startup] Skipping edit {entry['seq']}: {e}")
+            continue
+        builder.touch([section], touched_teachers, touched_students)
 
-    assign_time_blocks(list(sections.values()), students_list, teachers_list)
-    return check_for_conflicts(students_list, teachers_list)
+    # Every edit published a version, so numbering picks up where it left off
+    snapshot = builder.build(persisted.version + len(tail), edit_log.last_seq)
+    persisted_seq = persisted.edit_seq
+    history.add(snapshot)
+    print(f"[Startup] Restored schedule v{snapshot.version} ({len(tail)} edits replayed)")
+    return True
 
 
 # -------------------------------------------------
@@ -175,12 +158,18 @@ def run_scheduler() -> list[str]:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global snapshot, edit_log, roster_journal
     students.clear()
     teachers.clear()
     sections.clear()
 
     for s in load_student_csv("data/students.csv"):
         students[str(s.id)] = s
+    roster_journal = RosterJournal(ROSTER_JOURNAL_PATH)
+    replayed = roster_journal.replay(students)
+    if replayed.lines:
+        print(f"[Startup] Replayed {replayed.created} uploaded students ({replayed.updated} updates)")
+        roster_journal.compact(students)
 
     for t in load_teachers_csv("teachers.csv"):
         teachers[str(t.id)] = t
@@ -188,18 +177,31 @@ async def lifespan(app: FastAPI):
     print(f"[Startup] Loaded {len(students)} students")
     print(f"[Startup] Loaded {len(teachers)} teachers")
 
-    # Run the scheduler ONCE
-    schedule_result = run_scheduler()
+    snapshot = load_snapshot(SNAPSHOT_PATH)
+    edit_log = EditLog(EDIT_LOG_PATH, snapshot.edit_seq if snapshot else 0)
 
-    print(f"[Startup] Scheduler completed with {len(schedule_result)} conflicts")
-    
-    # Store results on app state
-    app.state.conflicts = schedule_result
+    app.state.scheduler_error = None
+    ready.clear()
+
+    # Pick up the persisted schedule and its edits; only reschedule without one
+    if snapshot is not None and recover(snapshot):
+        ready.set()
+    else:
+        def initial_run():
+            try:
+                conflicts = run_scheduler()
+                print(f"[Startup] Scheduler completed with {len(conflicts)} conflicts")
+            except Exception as e:
+                app.state.scheduler_error = str(e)
+                print(f"[Startup] Scheduler failed: {e}")
+
+        # Run the scheduler in the background so health checks answer right away
+        threading.Thread(target=initial_run, name="initial-schedule", daemon=True).start()
 
     yield
 
-    # Optional shutdown hook
-    # export_sections_to_csv(list(sections.values()), "final_sections.csv")
+    edit_log.close()
+    export_jobs.shutdown()
 
 
 # -------------------------------------------------
@@ -212,6 +214,22 @@ app = FastAPI(
 )
 
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+
+    # Label by route template so path parameters don't explode cardinality
+    route = request.scope.get("route")
+    metrics.REQUEST_SECONDS.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        path=route.path if route else "unmatched",
+        status=response.status_code
+    )
+    return response
+
+
 # -------------------------------------------------
 # API endpoints
 # -------------------------------------------------
@@ -221,26 +239,81 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def readiness():
+    if not ready.is_set():
+        return JSONResponse(
+            {"status": "starting", "error": app.state.scheduler_error},
+            status_code=503,
+            headers={"Retry-After": "5"}
+        )
+    return {"status": "ready", "version": snapshot.version}
+
+
+@app.get("/metrics")
+def get_metrics():
+    return PlainTextResponse(
+        metrics.REGISTRY.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/students")
 def get_students():
-    return [s.to_json() for s in students.values()]
+    return current_snapshot().students
+
+
+@app.post("/students:bulk")
+async def bulk_students(
+    request: Request,
+    format: Literal["csv", "ndjson"] | None = None,
+    reschedule: bool = False
+):
+    """
+    Adds or updates students from a streamed CSV or NDJSON body (see
+    ingest.py), keyed by the caller's external ids. The format defaults
+    from the Content-Type. Students join the schedule on the next run;
+    pass reschedule=true to run it right away. Applied rows are journaled,
+    so they are back on the roster after a restart.
+    """
+    global scenario_baseline
+    if format is None:
+        format = "ndjson" if "json" in request.headers.get("content-type", "") else "csv"
+    upsert = BulkUpsert(students, format)
+
+    try:
+        async for lines in iter_line_chunks(request.stream()):
+            # Parsing is CPU work and the lock may be held by a run, so keep both off the event loop
+            await run_in_threadpool(upsert.ingest, lines, scheduler_lock, roster_journal)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e), **upsert.report()})
+    finally:
+        # The roster changed without publishing a new version
+        scenario_baseline = None
+
+    result = upsert.report()
+    if reschedule and (upsert.created or upsert.updated):
+        conflicts = await run_in_threadpool(run_scheduler)
+        result["version"] = snapshot.version
+        result["conflicts"] = len(conflicts)
+    return result
 
 
 @app.get("/teachers")
 def get_teachers():
-    return [t.to_json() for t in teachers.values()]
+    return current_snapshot().teachers
 
 
 @app.get("/sections")
 def get_sections():
-    return [s.to_json() for s in sections.values()]
+    return current_snapshot().sections
 
 
 @app.get("/buckets")
 def get_buckets():
-    buckets, _ = create_buckets()
-    for b in buckets:
-        b.assign_students(list(students.values()))
+    # Bulk upserts change the roster under the same lock
+    with scheduler_lock:
+        buckets = assign_buckets(list(students.values()))
 
     return [
         {
@@ -257,14 +330,276 @@ def get_buckets():
 
 @app.post("/schedule")
 def schedule():
-    conflicts = app.state.conflicts
+    current = current_snapshot()
     return {
-        "sections": [s.to_json() for s in sections.values()],
+        "sections": current.sections,
+        "conflicts": current.conflicts
+    }
+
+
+@app.get("/changes")
+def get_changes(since: int):
+    """
+    What changed since schedule version `since`. Versions older than the
+    kept history answer 410, and the client should refetch everything.
+    """
+    current = current_snapshot()
+    if since > current.version:
+        raise HTTPException(status_code=400, detail=f"Version {since} has not been published yet")
+
+    changes = history.diff(since, current)
+    if changes is None:
+        raise HTTPException(status_code=410, detail=f"Version {since} is no longer kept; fetch the full schedule")
+    return changes
+
+
+@app.post("/edits")
+def post_edit(edit: dict = Body(...)):
+    """
+    Applies one manual edit (see editlog.py) and publishes the result,
+    re-rendering only the records it touched. Answers once the edit is
+    on disk.
+    """
+    global snapshot, persisted_seq
+    edit = {k: edit[k] for k in ("op", "section", "student", "teacher", "timeBlock") if k in edit}
+
+    with scheduler_lock:
+        current = current_snapshot()
+        try:
+            section, touched_students, touched_teachers = apply_edit(edit, students, teachers, sections)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=str(e.args[0]))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except IndexError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+        seq = edit_log.append(edit)
+        builder.touch([section], touched_teachers, touched_students)
+        published = snapshot = builder.build(current.version + 1, seq)
+        history.add(published)
+        if seq - persisted_seq >= SNAPSHOT_EVERY:
+            save_snapshot(published, SNAPSHOT_PATH)
+            edit_log.compact(seq)
+            persisted_seq = seq
+
+    # Outside the lock, so concurrent edits share an fsync
+    edit_log.wait_durable(seq)
+    return {"version": published.version, "seq": seq, "conflicts": len(published.conflicts)}
+
+
+@app.post("/scenarios")
+def post_scenario(overrides: dict = Body(default={})):
+    """
+    Schedules the current roster with `overrides` (see Scenario.from_json)
+    without touching the live schedule, and compares it to the live
+    configuration. The baseline is computed once per published version.
+    """
+    global scenario_baseline
+    current = current_snapshot()
+    try:
+        scenario = Scenario.from_json(overrides, BLOCK_CAPACITY)
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    with scheduler_lock:
+        # Copies taken under the lock, so a bulk upsert can't add or change students mid-run
+        roster = [copy.copy(s) for s in students.values()]
+        staff = list(teachers.values())
+    baseline = scenario_baseline
+    if baseline is None or baseline[0] != current.version:
+        baseline = scenario_baseline = (current.version, run_scenario(roster, staff, Scenario.from_json({}, BLOCK_CAPACITY)))
+
+    result = compare(baseline[1], run_scenario(roster, staff, scenario))
+    result["version"] = current.version
+    return result
+
+
+@app.get("/schedule/stream")
+def stream_schedule():
+    """
+    Server-sent events of a scheduler run: each stage starting and
+    finishing, conflict counts during coloring and repair, a summary,
+    then "done" (or "error"), after which the stream ends. Only follows
+    runs started elsewhere (POST /admin/reschedule, startup, bulk uploads
+    with reschedule): it follows the current run, or waits for the next.
+    A run replaces manual edits, so opening a stream never starts one.
+    """
+    subscriber = progress_feed.subscribe()
+
+    def events():
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=15)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse(event)
+                if event["event"] in ("done", "error"):
+                    return
+        finally:
+            progress_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/export", status_code=202)
+async def export(stream: Literal["sections", "schedules"] | None = None):
+    current = current_snapshot()
+
+    if stream is not None:
+        prefix, header, rows_attr = EXPORT_KINDS[stream]
+        return StreamingResponse(
+            iter_csv_chunks(header, getattr(current, rows_attr)),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{prefix}-v{current.version}.csv"'}
+        )
+
+    for kind in EXPORT_KINDS:
+        export_jobs.submit(current, kind)
+
+    return {
+        "version": current.version,
+        "exports": {
+            kind: {
+                "status": export_jobs.status(current.version, kind),
+                "download": f"/export/{current.version}/{kind}"
+            }
+            for kind in EXPORT_KINDS
+        }
+    }
+
+
+@app.get("/export/{version}/{kind}")
+def download_export(version: int, kind: str):
+    if kind not in EXPORT_KINDS:
+        raise HTTPException(status_code=404, detail="Unknown export kind")
+
+    status = export_jobs.status(version, kind)
+    if status == "missing":
+        raise HTTPException(status_code=404, detail="Export not found")
+    if status == "running":
+        return JSONResponse({"status": status}, status_code=202, headers={"Retry-After": "1"})
+    if status == "failed":
+        raise HTTPException(status_code=500, detail=str(export_jobs.get(version, kind).exception()))
+
+    path = export_jobs.get(version, kind).result()
+    return FileResponse(path, media_type="text/csv", filename=os.path.basename(path))
+
+
+# -------------------------------------------------
+# Tenant endpoints
+# -------------------------------------------------
+
+def get_tenant(tenant_id: str) -> Tenant:
+    try:
+        return tenants.get(tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+
+def tenant_snapshot(tenant_id: str) -> ScheduleSnapshot:
+    current = get_tenant(tenant_id).snapshot
+    if current is None:
+        raise HTTPException(status_code=404, detail="Tenant has not been scheduled yet")
+    return current
+
+
+@app.get("/tenants")
+def list_tenants():
+    return [{"id": t, "loaded": tenants.is_loaded(t)} for t in tenants.ids()]
+
+
+@app.put("/tenants/{tenant_id}")
+def put_tenant(tenant_id: str, config: dict = Body(default={})):
+    try:
+        tenant = tenants.put(tenant_id, TenantConfig.from_json(config))
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"id": tenant.id, "config": tenant.config.to_json()}
+
+
+@app.get("/tenants/{tenant_id}")
+def get_tenant_info(tenant_id: str):
+    tenant = get_tenant(tenant_id)
+    current = tenant.snapshot
+    return {
+        "id": tenant.id,
+        "config": tenant.config.to_json(),
+        "hasRoster": tenant.has_roster(),
+        "version": current.version if current else None
+    }
+
+
+@app.put("/tenants/{tenant_id}/roster/{kind}")
+async def put_tenant_roster(tenant_id: str, kind: Literal["students", "teachers"], request: Request):
+    get_tenant(tenant_id)
+    tenants.write_roster_file(tenant_id, f"{kind}.csv", await request.body())
+    return {"status": "stored"}
+
+
+@app.post("/tenants/{tenant_id}/schedule")
+def schedule_tenant(tenant_id: str):
+    tenant = get_tenant(tenant_id)
+    if not tenant.has_roster():
+        raise HTTPException(status_code=409, detail="Upload students and teachers first")
+
+    conflicts = tenant.run()
+    version = tenant.snapshot.version
+    tenants.enforce_budget()
+    return {"version": version, "conflicts": conflicts}
+
+
+@app.get("/tenants/{tenant_id}/students")
+def get_tenant_students(tenant_id: str):
+    return tenant_snapshot(tenant_id).students
+
+
+@app.get("/tenants/{tenant_id}/teachers")
+def get_tenant_teachers(tenant_id: str):
+    return tenant_snapshot(tenant_id).teachers
+
+
+@app.get("/tenants/{tenant_id}/sections")
+def get_tenant_sections(tenant_id: str):
+    return tenant_snapshot(tenant_id).sections
+
+
+@app.get("/tenants/{tenant_id}/time-blocks")
+def get_tenant_time_blocks(tenant_id: str):
+    return get_tenant(tenant_id).config.to_json()["time_blocks"]
+
+
+# -------------------------------------------------
+# Admin endpoints
+# -------------------------------------------------
+
+@app.post("/admin/reschedule")
+def reschedule(profile_request: bool = Query(False, alias="profile")):
+    with profile("admin-reschedule") if profile_request else nullcontext():
+        conflicts = run_scheduler()
+    return {
+        "version": snapshot.version,
+        "sections": len(sections),
         "conflicts": conflicts
     }
 
 
-@app.post("/export")
-def export():
-    export_sections_to_csv(list(sections.values()), "final_sections.csv")
-    return {"status": "exported"}
+@app.get("/admin/profiles")
+def get_profiles():
+    return list_profiles()
+
+
+@app.get("/admin/profiles/{file_name}")
+def download_profile(file_name: str):
+    path = profile_path(file_name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=file_name)
@@ -0,0 +1,162 @@
+"""
+Batch scheduler for many cohorts at once.
+
+Cohorts come either from a directory, where every subdirectory holding
+a students.csv and teachers.csv is one cohort, or from a JSON-lines
+manifest:
+
+    {"name": "east-fall", "students": "east/students.csv", "teachers": "east/teachers.csv", "class_limit": 7}
+
+(paths are relative to the manifest; "class_limit" and "block_capacity",
+the rooms per time block, are optional). Each cohort is scheduled in a
+worker process with its own time limit, its outputs are written to
+<out-dir>/<name>/, and one JSON summary line per cohort is streamed to
+stdout as soon as it finishes:
+
+    python batch.py cohorts/ --out-dir out/batch --workers 8 --time-limit 300
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from constants import CLASS_LIMIT
+from export import JSON_FORMATS, export_schedule_json, export_sections_csv, export_student_schedules_csv
+
+
+class CohortTimeout(Exception):
+    pass
+
+
+def find_cohorts(source: str) -> list[dict]:
+    """Returns the cohorts described by a directory or a JSON-lines manifest."""
+    if os.path.isdir(source):
+        cohorts = []
+        for name in sorted(os.listdir(source)):
+            directory = os.path.join(source, name)
+            students = os.path.join(directory, "students.csv")
+            teachers = os.path.join(directory, "teachers.csv")
+            if os.path.exists(students) and os.path.exists(teachers):
+                cohorts.append({"name": name, "students": students, "teachers": teachers})
+        return cohorts
+
+    base = os.path.dirname(source)
+    cohorts = []
+    with open(source) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            cohort = json.loads(line)
+            cohort["students"] = os.path.join(base, cohort["students"])
+            cohort["teachers"] = os.path.join(base, cohort["teachers"])
+            cohorts.append(cohort)
+    return cohorts
+
+
+def _raise_timeout(signum, frame):
+    raise CohortTimeout()
+
+
+def schedule_cohort(cohort: dict, out_dir: str, time_limit: float, json_format: str) -> dict:
+    """Schedules one cohort in a worker process and returns its summary."""
+    # Imported here so each worker pays for pandas only once it has work
+    from scheduler import run_pipeline
+    from student import load_student_csv
+    from teacher import load_teachers_csv
+
+    summary = {"cohort": cohort["name"], "status": "ok"}
+    timings = {}
+    start = time.perf_counter()
+
+    # SIGALRM only exists on POSIX; elsewhere cohorts run without a limit
+    use_alarm = time_limit > 0 and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, time_limit)
+
+    try:
+        load_start = time.perf_counter()
+        students = load_student_csv(cohort["students"])
+        teachers = load_teachers_csv(cohort["teachers"])
+        timings["load"] = time.perf_counter() - load_start
+
+        sections, issues = run_pipeline(
+            students,
+            teachers,
+            int(cohort.get("class_limit", CLASS_LIMIT)),
+            timings=timings,
+            block_capacity=cohort.get("block_capacity")
+        )
+
+        export_start = time.perf_counter()
+        cohort_dir = os.path.join(out_dir, cohort["name"])
+        os.makedirs(cohort_dir, exist_ok=True)
+        export_schedule_json(sections, teachers, students, cohort_dir, json_format)
+        export_sections_csv(sections, os.path.join(cohort_dir, "final_sections.csv"))
+        export_student_schedules_csv(students, os.path.join(cohort_dir, "student_schedules.csv"))
+        timings["export"] = time.perf_counter() - export_start
+
+        summary.update({
+            "students": len(students),
+            "teachers": len(teachers),
+            "sections": len(sections),
+            "unassignedSections": sum(1 for s in sections if s.get_teacher() is None),
+            **issues.counts(),
+            "output": cohort_dir,
+        })
+    except CohortTimeout:
+        summary.update({"status": "timeout", "error": f"exceeded {time_limit}s"})
+    except Exception as e:
+        summary.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    summary["timings"] = timings
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Schedule many cohorts in parallel.")
+    parser.add_argument("source", help="directory of cohort folders, or a JSON-lines manifest")
+    parser.add_argument("--out-dir", default="out/batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--time-limit", type=float, default=600, help="seconds per cohort, 0 for none")
+    parser.add_argument("--json-format", choices=JSON_FORMATS, default="compact")
+    parser.add_argument("--summary", help="also append summary lines to this file")
+    args = parser.parse_args(argv)
+
+    cohorts = find_cohorts(args.source)
+    names = [c["name"] for c in cohorts]
+    if len(set(names)) != len(names):
+        parser.error("cohort names must be unique")
+
+    failed = 0
+    summary_file = open(args.summary, "a") if args.summary else None
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [
+                pool.submit(schedule_cohort, c, args.out_dir, args.time_limit, args.json_format)
+                for c in cohorts
+            ]
+            for future in as_completed(futures):
+                summary = future.result()
+                failed += summary["status"] != "ok"
+                line = json.dumps(summary)
+                print(line, flush=True)
+                if summary_file:
+                    summary_file.write(line + "\n")
+                    summary_file.flush()
+    finally:
+        if summary_file:
+            summary_file.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+from batch import schedule_cohort
+
+
+def test_cohort_summary_counts_issues_by_kind(tmp_path):
+    cohort = {"name": "sample", "students": "data/students.csv", "teachers": "teachers.csv"}
+    summary = schedule_cohort(cohort, str(tmp_path), 0, "compact")
+
+    assert summary["status"] == "ok", summary.get("error")
+    # The sample roster's one issue is a student the teachers can't cover
+    assert (summary["overflow"], summary["infeasible"], summary["conflicts"]) == (1, 0, 0)
@@ -0,0 +1,166 @@
+"""
+Scaling benchmark for the scheduling pipeline.
+
+Generates a seeded roster for each size, times every pipeline stage and
+writes the results as JSON. When a baseline file exists, any stage that
+got slower than the baseline by more than the tolerance fails the run:
+
+    python bench.py --sizes 1000 10000
+    python bench.py --sizes 1000 10000 --update-baseline
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from constants import CLASS_LIMIT, TIME_BLOCKS
+from consecutive import ConsecutiveLimit
+from export import export_schedule_json
+from feasibility import check_feasibility
+from generate import generate_roster
+from objective import Objective
+from scheduler import (
+    assign_buckets,
+    assign_teachers,
+    assign_time_blocks,
+    build_conflict_graph,
+    check_for_conflicts,
+    create_sections,
+    plan_sections,
+    repair_student_conflicts,
+)
+from student import load_student_csv
+from teacher import load_teachers_csv
+
+DEFAULT_RESULTS = "out/bench_results.json"
+DEFAULT_BASELINE = "data/bench_baseline.json"
+
+
+class StageTimer:
+    """Records the wall time of each named stage in seconds."""
+
+    def __init__(self):
+        self.timings = {}
+
+    def __call__(self, stage: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.timings[stage] = time.perf_counter() - start
+
+
+def run_size(size: int, seed: int, work_dir: str) -> dict:
+    """Runs the full pipeline on a generated roster of `size` students."""
+    students_path, teachers_path = generate_roster(
+        os.path.join(work_dir, str(size)), size, seed=seed
+    )
+    timer = StageTimer()
+    result = {"students": size}
+
+    def load():
+        return load_student_csv(students_path), load_teachers_csv(teachers_path)
+
+    students, teachers = timer("load", load)
+    buckets = timer("bucketing", assign_buckets, students)
+    plan = timer("planning", plan_sections, buckets, teachers, CLASS_LIMIT, TIME_BLOCKS)
+    sections = timer("section_creation", create_sections, buckets, CLASS_LIMIT, plan)
+    unassigned = timer("teacher_assignment", assign_teachers, sections, teachers, plan.quotas)
+    conflicts = timer("conflict_graph", build_conflict_graph, sections, students, teachers)
+    report = timer(
+        "feasibility", check_feasibility, sections, students, teachers, conflicts, len(TIME_BLOCKS), ConsecutiveLimit()
+    )
+
+    timer(
+        "coloring", assign_time_blocks, sections, students, teachers, conflicts, TIME_BLOCKS,
+        strict=False, equitable=True
+    )
+    repaired = timer("repair", repair_student_conflicts, sections, students)
+    issues = timer("conflict_check", check_for_conflicts, students, teachers)
+    objective = timer("scoring", Objective, sections)
+    timer("json_export", export_schedule_json, sections, teachers, students, work_dir)
+
+    result.update({
+        "teachers": len(teachers),
+        "sections": len(sections),
+        "unassignedSections": len(unassigned),
+        "overflowStudents": sum(len(v) for v in plan.overflow.values()),
+        "feasible": report.feasible,
+        "conflictEdges": sum(len(n) for n in conflicts.values()) // 2,
+        "repairedConflicts": repaired,
+        "conflicts": len(issues),
+        "softPenalty": objective.breakdown(),
+        "stages": timer.timings,
+    })
+    return result
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float, min_delta: float) -> list[str]:
+    """
+    Compares stage timings to the baseline. A stage regresses when it is
+    both `tolerance` times slower and at least `min_delta` seconds slower.
+    """
+    regressions = []
+    for size, run in results["sizes"].items():
+        base_run = baseline.get("sizes", {}).get(size)
+        if base_run is None:
+            continue
+        for stage, seconds in run["stages"].items():
+            base = base_run["stages"].get(stage)
+            if base is None:
+                continue
+            if seconds > base * tolerance and seconds - base > min_delta:
+                regressions.append(
+                    f"{size} students, {stage}: {seconds:.3f}s vs baseline {base:.3f}s"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler across roster sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_RESULTS)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="allowed slowdown factor per stage")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many seconds")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = {"seed": args.seed, "sizes": {}}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            run = run_size(size, args.seed, work_dir)
+            results["sizes"][str(size)] = run
+            stages = ", ".join(f"{k}={v:.3f}s" for k, v in run["stages"].items())
+            print(f"[Bench] {size} students: {stages}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[Bench] Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"[Bench] No baseline at {args.baseline}, skipping comparison")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = find_regressions(results, baseline, args.tolerance, args.min_delta)
+    for r in regressions:
+        print(f"[Bench] Regression: {r}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
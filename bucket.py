@@ -1,6 +1,5 @@
 import math
 from student import Student
-from constants import get_level
 
 
 class Bucket:
@@ -8,14 +7,16 @@ class Bucket:
         self.level = level
         self.subject = subject
         self.students = []
+        self._ids = set()
     
     def add_student(self, student) -> None:
-        if student not in self.students:
+        if id(student) not in self._ids:
+            self._ids.add(id(student))
             self.students.append(student)
             
     def assign_students(self, students: list[Student]) -> None:
         for student in students:
-            if get_level(student.get_subject_rankings()[self.subject]) == self.level:
+            if self.subject in student.table.rows and student.get_level(self.subject) == self.level:
                 self.add_student(student)
                 
     def get_sections_needed(self, class_limit: int = 7) -> int:
@@ -37,8 +38,7 @@ class Bucket:
     def __repr__(self):
         return self.__str__()
     
-def create_buckets() -> tuple[list[Bucket], dict[str, Bucket]]:
-    subjects = ["english", "math", "asl"]
+def create_buckets(subjects: list[str]) -> tuple[list[Bucket], dict[str, Bucket]]:
     levels = [0, 1, 2]  # 0: beginning, 1: intermediate, 2: advanced
     buckets = []
     
@@ -51,20 +51,20 @@ def create_buckets() -> tuple[list[Bucket], dict[str, Bucket]]:
     return buckets, buckets_dict
 
 if __name__ == "__main__":
-    buckets, buckets_dict = create_buckets()
+    buckets, buckets_dict = create_buckets(["english", "math", "asl"])
     for bucket in buckets:
         print(bucket)
         
     print(buckets_dict)
     
     students = [
-        Student("Alice", 2, 5, 8),
-        Student("Bob", 7, 3, 1),
-        Student("Charlie", 4, 6, 2),
-        Student("David", 1, 9, 5)
+        Student("Alice", {"english": 2, "math": 5, "asl": 8}),
+        Student("Bob", {"english": 7, "math": 3, "asl": 1}),
+        Student("Charlie", {"english": 4, "math": 6, "asl": 2}),
+        Student("David", {"english": 1, "math": 9, "asl": 5})
     ]
     
     for bucket in buckets:
         bucket.assign_students(students)
         print(f"{bucket}: {bucket.get_size()} students")
-        print(f"Students: {bucket.get_students()}")
\ No newline at end of file
+        print(f"Students: {bucket.get_students()}")
@@ -0,0 +1,111 @@
+"""
+Back-to-back teaching limits, checked with bitmasks.
+
+Bit i of a teacher's mask is set once they teach in time_blocks[i]. Two
+blocks are back to back when they meet on a common day and the second
+starts at most PASSING_MINUTES after the first ends, with no break
+(lunch) between them. Placing a section breaks a limit of L when it
+completes a chain of L + 1 back-to-back blocks on one day; the masks of
+those windows are precomputed per block, so a check is one OR plus an
+AND and a compare per window.
+"""
+from collections import defaultdict
+
+from constants import LUNCH_TIME, TIME_BLOCKS
+from teacher import Teacher
+from time_block import TimeBlock, time_model
+
+# Longest gap between two classes that still counts as back to back
+PASSING_MINUTES = 30
+
+
+def _minutes(hhmm: int) -> int:
+    return hhmm // 100 * 60 + hhmm % 100
+
+
+def follows(first: TimeBlock, second: TimeBlock, breaks: tuple[TimeBlock, ...] = (LUNCH_TIME,)) -> bool:
+    """Whether `second` starts right after `first` ends, on a day they share."""
+    gap = _minutes(second.start) - _minutes(first.end)
+    if not set(first.days) & set(second.days) or not 0 <= gap <= PASSING_MINUTES:
+        return False
+    return not any(first.end <= b.start and b.end <= second.start for b in breaks)
+
+
+class ConsecutiveLimit:
+    def __init__(self, time_blocks: list[TimeBlock] = TIME_BLOCKS, breaks: tuple[TimeBlock, ...] = (LUNCH_TIME,)):
+        self.model = time_model(time_blocks)
+        self.bits = {block: 1 << i for block, i in self.model.ids.items()}
+        blocks = self.model.blocks
+        # i -> blocks that follow block i
+        self._next = [
+            [j for j, other in enumerate(blocks) if follows(block, other, breaks)]
+            for block in blocks
+        ]
+        self.masks: dict[Teacher, int] = defaultdict(int)
+        self._windows: dict[int, dict[int, list[int]]] = {}
+        self._max_blocks: dict[int, int] = {}
+
+    def _chains(self, length: int) -> set[int]:
+        """Masks of every chain of `length` back-to-back blocks meeting on a common day."""
+        chains = set()
+
+        def extend(i: int, mask: int, days: set, remaining: int):
+            if remaining == 0:
+                chains.add(mask)
+                return
+            for j in self._next[i]:
+                shared = days & set(self.model.blocks[j].days)
+                if shared:
+                    extend(j, mask | 1 << j, shared, remaining - 1)
+
+        for i, block in enumerate(self.model.blocks):
+            extend(i, 1 << i, set(block.days), length - 1)
+        return chains
+
+    def windows(self, limit: int) -> dict[int, list[int]]:
+        """block bit -> masks of every limit + 1 back-to-back blocks containing it."""
+        if limit not in self._windows:
+            windows = defaultdict(list)
+            for mask in self._chains(limit + 1):
+                for i in range(len(self.model.blocks)):
+                    if mask >> i & 1:
+                        windows[1 << i].append(mask)
+            self._windows[limit] = windows
+        return self._windows[limit]
+
+    def max_blocks(self, limit: int) -> int:
+        """
+        Most blocks one teacher can fill: no two overlapping and none going
+        over `limit` in a row. A small branch and bound over the blocks.
+        """
+        if limit not in self._max_blocks:
+            windows = self.windows(limit)
+            count = len(self.model.blocks)
+            best = 0
+
+            def search(i: int, mask: int, taken: int):
+                nonlocal best
+                if taken + count - i <= best:
+                    return
+                if i == count:
+                    best = taken
+                    return
+                bit = 1 << i
+                if not mask & self.model.masks[i] and all((mask | bit) & w != w for w in windows.get(bit, ())):
+                    search(i + 1, mask | bit, taken + 1)
+                search(i + 1, mask, taken)
+
+            search(0, 0, 0)
+            self._max_blocks[limit] = best
+        return self._max_blocks[limit]
+
+    def allows(self, teacher: Teacher | None, block: TimeBlock) -> bool:
+        if teacher is None:
+            return True
+        bit = self.bits[block]
+        mask = self.masks[teacher] | bit
+        return all(mask & window != window for window in self.windows(teacher.max_consecutive).get(bit, ()))
+
+    def add(self, teacher: Teacher | None, block: TimeBlock) -> None:
+        if teacher is not None:
+            self.masks[teacher] |= self.bits[block]
@@ -1,3 +1,6 @@
+import uuid
+
+import numpy as np
 from time_block import TimeBlock
 
 
@@ -5,6 +8,7 @@ BEGINNER = 0
 INTERMEDIATE = 1
 ADVANCED = 2
 CLASS_LIMIT = 7
+MAX_CONSECUTIVE = 2 # most sections a teacher teaches back to back
 BLOCK_ONE = TimeBlock(800, 900)
 BLOCK_TWO = TimeBlock(915, 1015)
 BLOCK_THREE = TimeBlock(1045, 1145)
@@ -12,13 +16,26 @@ LUNCH_TIME = TimeBlock(1145, 1245)
 BLOCK_FOUR = TimeBlock(1245, 1345)
 BLOCK_FIVE = TimeBlock(1400, 1500)
 BLOCK_SIX = TimeBlock(1530, 1630)
+LEVELS = [BEGINNER, INTERMEDIATE, ADVANCED]
 LEVEL_DICT = {
     BEGINNER: "Beginner",
     INTERMEDIATE: "Intermediate",
     ADVANCED: "Advanced"
 }
 
+# Namespace of the name-derived (uuid5) ids of students, teachers and sections
+ID_NAMESPACE = uuid.UUID("6f1c2a7e-3b0d-5e4f-9a8b-2c1d0e9f8a7b")
+
 TIME_BLOCKS = [BLOCK_ONE, BLOCK_TWO, BLOCK_THREE, BLOCK_FOUR, BLOCK_FIVE, BLOCK_SIX]
 
+# Student CSV headers that name a subject differently than teachers.csv
+SUBJECT_ALIASES = {
+    "reading": "english"
+}
+
 def get_level(score: int):
-    return 0 if score <= 3 else 2 if score > 6 else 1
\ No newline at end of file
+    return 0 if score <= 3 else 2 if score > 6 else 1
+
+def get_levels(scores: np.ndarray) -> np.ndarray:
+    """get_level for a whole array of scores at once."""
+    return np.where(scores <= 3, 0, np.where(scores > 6, 2, 1)).astype(np.int8)
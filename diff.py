@@ -0,0 +1,115 @@
+"""
+Differences between two schedule snapshots.
+
+Section ids are derived from subject, level, teacher and ordinal (see
+scheduler.assign_section_ids), and student/teacher ids from their names,
+so the same schedule gets the same ids on every run and a diff only
+lists what really changed. Everything is keyed by id, so a diff is a few
+dict lookups per section and student.
+"""
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from snapshot import ScheduleSnapshot
+
+
+def _changed_ids(old: tuple[dict, ...], new: tuple[dict, ...], field: str) -> list[dict]:
+    """Records whose id list `field` changed, with what was added and removed."""
+    before = {r["id"]: set(r[field]) for r in old}
+    changes = []
+    for record in new:
+        previous = before.get(record["id"], set())
+        current = set(record[field])
+        if previous != current:
+            changes.append({
+                "id": record["id"],
+                "added": sorted(current - previous),
+                "removed": sorted(previous - current)
+            })
+    new_ids = {r["id"] for r in new}
+    changes += [
+        {"id": record_id, "added": [], "removed": sorted(ids), "deleted": True}
+        for record_id, ids in before.items()
+        if record_id not in new_ids
+    ]
+    return changes
+
+
+def diff_snapshots(old: "ScheduleSnapshot", new: "ScheduleSnapshot") -> dict:
+    """
+    What changed from `old` to `new`:
+
+    - sections added (full records) and removed (ids)
+    - sections moved to another time block
+    - sections reassigned to another teacher: a rescheduled section's id
+      changes with the teacher, so a removed and an added section with
+      the same subject, level and students are reported as one
+      reassignment; a manual reassign edit keeps the id
+    - sections whose enrollment changed
+    - students and teachers whose sections changed
+    """
+    old_sections = {s["id"]: s for s in old.sections}
+    new_sections = {s["id"]: s for s in new.sections}
+
+    added = [s for s in new.sections if s["id"] not in old_sections]
+    removed = [s for s in old.sections if s["id"] not in new_sections]
+
+    # Pair teacher changes back up before reporting the rest as added/removed
+    by_content = {}
+    for section in removed:
+        by_content.setdefault((section["subject"], section["level"], frozenset(section["studentIds"])), []).append(section)
+    reassigned = []
+    unpaired = []
+    for section in added:
+        candidates = by_content.get((section["subject"], section["level"], frozenset(section["studentIds"])))
+        if candidates:
+            previous = candidates.pop()
+            reassigned.append({
+                "from": previous["id"],
+                "to": section["id"],
+                "teacherFrom": previous["teacherId"],
+                "teacherTo": section["teacherId"],
+                "timeBlockFrom": previous["timeBlockId"],
+                "timeBlockTo": section["timeBlockId"]
+            })
+        else:
+            unpaired.append(section)
+    paired = {r["from"] for r in reassigned}
+
+    moved = []
+    for section_id, section in new_sections.items():
+        previous = old_sections.get(section_id)
+        if previous is None:
+            continue
+        if previous["timeBlockId"] != section["timeBlockId"]:
+            moved.append({"id": section_id, "from": previous["timeBlockId"], "to": section["timeBlockId"]})
+        if previous["teacherId"] != section["teacherId"]:
+            reassigned.append({
+                "from": section_id,
+                "to": section_id,
+                "teacherFrom": previous["teacherId"],
+                "teacherTo": section["teacherId"],
+                "timeBlockFrom": previous["timeBlockId"],
+                "timeBlockTo": section["timeBlockId"]
+            })
+
+    kept_old = tuple(s for s in old.sections if s["id"] in new_sections)
+    kept_new = tuple(s for s in new.sections if s["id"] in old_sections)
+
+    return {
+        "from": old.version,
+        "to": new.version,
+        "sections": {
+            "added": unpaired,
+            "removed": [s["id"] for s in removed if s["id"] not in paired],
+            "moved": moved,
+            "reassigned": reassigned,
+            "enrollment": _changed_ids(kept_old, kept_new, "studentIds")
+        },
+        "students": _changed_ids(old.students, new.students, "sectionIds"),
+        "teachers": _changed_ids(old.teachers, new.teachers, "sectionIds"),
+        "conflicts": {
+            "added": sorted(set(new.conflicts) - set(old.conflicts)),
+            "resolved": sorted(set(old.conflicts) - set(new.conflicts))
+        }
+    }
@@ -0,0 +1,102 @@
+import dataclasses
+
+from constants import TIME_BLOCKS
+from diff import diff_snapshots
+from editlog import apply_edit
+from scheduler import run_pipeline
+from snapshot import take_snapshot
+from student import load_student_csv
+from teacher import load_teachers_csv
+
+
+def schedule():
+    students = {str(s.id): s for s in load_student_csv("data/students.csv")}
+    teachers = {str(t.id): t for t in load_teachers_csv("teachers.csv")}
+    sections_list, issues = run_pipeline(list(students.values()), list(teachers.values()))
+    sections = {str(s.get_id()): s for s in sections_list}
+    return students, teachers, sections
+
+
+def snapshot(version, students, teachers, sections):
+    return take_snapshot(version, list(sections.values()), list(teachers.values()), list(students.values()), [])
+
+
+def test_reassign_edit_is_reported_under_reassigned():
+    students, teachers, sections = schedule()
+    before = snapshot(1, students, teachers, sections)
+
+    section = next(s for s in sections.values() if s.get_subject() == "math")
+    previous = section.get_teacher()
+    other = next(
+        t for t in teachers.values()
+        if t is not previous and t.subjects.get("math", -1) != -1 and not t.is_full()
+    )
+    apply_edit({"op": "reassign", "section": str(section.get_id()), "teacher": str(other.id)}, students, teachers, sections)
+    changes = diff_snapshots(before, snapshot(2, students, teachers, sections))
+
+    block = next(r["timeBlockId"] for r in before.sections if r["id"] == str(section.get_id()))
+    assert changes["sections"]["reassigned"] == [{
+        "from": str(section.get_id()),
+        "to": str(section.get_id()),
+        "teacherFrom": str(previous.id),
+        "teacherTo": str(other.id),
+        "timeBlockFrom": block,
+        "timeBlockTo": block
+    }]
+    assert changes["sections"]["added"] == [] and changes["sections"]["removed"] == []
+    assert {c["id"] for c in changes["teachers"]} == {str(previous.id), str(other.id)}
+
+
+def test_identical_snapshots_have_no_changes():
+    students, teachers, sections = schedule()
+    changes = diff_snapshots(snapshot(1, students, teachers, sections), snapshot(2, students, teachers, sections))
+    assert (changes["from"], changes["to"]) == (1, 2)
+    assert all(not v for v in changes["sections"].values())
+    assert changes["students"] == changes["teachers"] == []
+    assert changes["conflicts"] == {"added": [], "resolved": []}
+
+
+def test_moves_and_enrollment_changes():
+    students, teachers, sections = schedule()
+    before = snapshot(1, students, teachers, sections)
+
+    section = next(s for s in sections.values() if s.get_students())
+    student = section.get_students()[0]
+    old_block = next(r["timeBlockId"] for r in before.sections if r["id"] == str(section.get_id()))
+    new_block = (old_block + 1) % len(TIME_BLOCKS)
+    apply_edit({"op": "move", "section": str(section.get_id()), "timeBlock": new_block}, students, teachers, sections)
+    apply_edit({"op": "drop", "section": str(section.get_id()), "student": str(student.id)}, students, teachers, sections)
+    changes = diff_snapshots(before, snapshot(2, students, teachers, sections))
+
+    assert changes["sections"]["moved"] == [{"id": str(section.get_id()), "from": old_block, "to": new_block}]
+    assert changes["sections"]["enrollment"] == [{"id": str(section.get_id()), "added": [], "removed": [str(student.id)]}]
+    assert changes["students"] == [{"id": str(student.id), "added": [], "removed": [str(section.get_id())]}]
+
+
+def test_rescheduled_section_with_a_new_teacher_is_paired_up():
+    students, teachers, sections = schedule()
+    before = snapshot(1, students, teachers, sections)
+
+    # A rescheduled section's id changes with its teacher; its students stay
+    i, record = next((i, r) for i, r in enumerate(before.sections) if r["studentIds"])
+    others = before.sections[:i] + before.sections[i + 1:]
+    renamed = {**record, "id": "new-id", "teacherId": "new-teacher"}
+    after = dataclasses.replace(before, version=2, sections=others + (renamed,))
+    changes = diff_snapshots(before, after)
+
+    assert changes["sections"]["added"] == [] and changes["sections"]["removed"] == []
+    assert changes["sections"]["reassigned"] == [{
+        "from": record["id"],
+        "to": "new-id",
+        "teacherFrom": record["teacherId"],
+        "teacherTo": "new-teacher",
+        "timeBlockFrom": record["timeBlockId"],
+        "timeBlockTo": record["timeBlockId"]
+    }]
+
+    # A section that differs in its students too is an addition and a removal
+    changed = {**renamed, "studentIds": []}
+    after = dataclasses.replace(before, version=2, sections=others + (changed,))
+    changes = diff_snapshots(before, after)
+    assert changes["sections"]["added"] == [changed]
+    assert changes["sections"]["removed"] == [record["id"]]
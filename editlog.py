@@ -0,0 +1,249 @@
+"""
+Manual schedule edits, kept in an append-only log.
+
+An edit is a small JSON object:
+
+    {"op": "enroll",   "section": <section id>, "student": <student id>}
+    {"op": "drop",     "section": <section id>, "student": <student id>}
+    {"op": "reassign", "section": <section id>, "teacher": <teacher id>}
+    {"op": "move",     "section": <section id>, "timeBlock": <time block id>}
+
+Every applied edit is appended to the log with a sequence number. The
+published snapshot records the last sequence number it includes
+(ScheduleSnapshot.edit_seq), and each time it is persisted the log is
+compacted down to the entries after it. Recovery is then: rebuild the
+sections from the persisted snapshot, replay the (short) log tail.
+
+Appends only write to the file; a background thread fsyncs whatever has
+been written since its last pass, so concurrent edits share one fsync
+(group commit). append() returns once the write is queued and
+wait_durable() blocks until it has reached the disk.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+
+from constants import CLASS_LIMIT, TIME_BLOCKS
+from export import atomic_open
+from section import Section
+from snapshot import ScheduleSnapshot
+from student import Student
+from teacher import Teacher
+from time_block import TimeBlock
+
+EDIT_OPS = ("enroll", "drop", "reassign", "move")
+
+
+def _lookup(kind: str, items: dict, key) -> object:
+    try:
+        return items[str(key)]
+    except KeyError:
+        raise KeyError(f"Unknown {kind} {key}")
+
+
+def apply_edit(
+    edit: dict,
+    students: dict[str, Student],
+    teachers: dict[str, Teacher],
+    sections: dict[str, Section],
+    time_blocks: list[TimeBlock] = TIME_BLOCKS
+) -> tuple[Section, list[Student], list[Teacher]]:
+    """
+    Applies one edit to the live objects, or raises (KeyError for unknown
+    ids, ValueError/IndexError for edits that would break a rule) without
+    changing anything. Returns the section and the students and teachers
+    whose schedules changed (see SnapshotBuilder.touch).
+    """
+    op = edit.get("op")
+    if op not in EDIT_OPS:
+        raise ValueError(f"Unknown edit op {op!r}, expected one of {EDIT_OPS}")
+    section = _lookup("section", sections, edit.get("section"))
+
+    if op in ("enroll", "drop"):
+        student = _lookup("student", students, edit.get("student"))
+        enrolled = student in section.get_students()
+        if op == "enroll":
+            if enrolled:
+                raise ValueError(f"{student.name} is already in section {edit['section']}")
+            if section.is_full():
+                raise IndexError("Class is at capacity.")
+            section.add_student(student)
+            student.add_section(section)
+        else:
+            if not enrolled:
+                raise ValueError(f"{student.name} is not in section {edit['section']}")
+            section.remove_student(student)
+            student.remove_section(section)
+        return section, [student], []
+
+    elif op == "reassign":
+        teacher = _lookup("teacher", teachers, edit.get("teacher"))
+        previous = section.get_teacher()
+        if previous is teacher:
+            return section, [], []
+        section.set_teacher(teacher)
+        teacher.add_section(section)
+        if previous is not None and section in previous.schedule:
+            previous.schedule.remove(section)
+        # Everyone in the section sees the new teacher's name in their schedule
+        return section, list(section.get_students()), [t for t in (previous, teacher) if t is not None]
+
+    else:
+        block = edit.get("timeBlock")
+        if not isinstance(block, int) or not 0 <= block < len(time_blocks):
+            raise ValueError(f"timeBlock must be an id between 0 and {len(time_blocks) - 1}")
+        section.set_time(time_blocks[block])
+        teacher = section.get_teacher()
+        return section, list(section.get_students()), [teacher] if teacher is not None else []
+
+
+def restore_sections(
+    snapshot: ScheduleSnapshot,
+    students: dict[str, Student],
+    teachers: dict[str, Teacher],
+    time_blocks: list[TimeBlock] = TIME_BLOCKS,
+    class_limit: int = CLASS_LIMIT
+) -> dict[str, Section]:
+    """
+    Rebuilds the live sections (and everyone's schedules) from a
+    snapshot. Raises ValueError if the roster's students or teachers
+    aren't exactly the snapshot's: anyone added since would be left
+    without sections, anyone removed can't be placed back.
+    """
+    for kind, people, records in (("students", students, snapshot.students), ("teachers", teachers, snapshot.teachers)):
+        if set(people) != {r["id"] for r in records}:
+            raise ValueError(f"the {kind} on the roster changed since the snapshot was taken")
+
+    for person in (*students.values(), *teachers.values()):
+        person.schedule.clear()
+
+    sections = {}
+    for record in snapshot.sections:
+        enrolled = [_lookup("student", students, s) for s in record["studentIds"]]
+        block = record["timeBlockId"]
+        section = Section(
+            record["subject"],
+            record["level"],
+            time_blocks[block] if block is not None else None,
+            capacity=max(class_limit, len(enrolled))
+        )
+        section.set_id(uuid.UUID(record["id"]))
+        if record["teacherId"] is not None:
+            teacher = _lookup("teacher", teachers, record["teacherId"])
+            section.set_teacher(teacher)
+            teacher.add_section(section)
+        for student in enrolled:
+            section.add_student(student)
+            student.add_section(section)
+        sections[str(record["id"])] = section
+    return sections
+
+
+class EditLog:
+    def __init__(self, path: str, start: int = 0, flush_interval: float = 0.005):
+        """
+        `start` is the edit_seq of the persisted snapshot: numbering
+        continues after it even when compaction left the log empty.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        entries, torn = self._read()
+        if torn:
+            # Cut off the half-written last line so new entries start on a clean line
+            with atomic_open(path, "w") as f:
+                f.writelines(json.dumps(e, separators=(",", ":")) + "\n" for e in entries)
+        self._written = self._synced = max(start, entries[-1]["seq"] if entries else 0)
+        self._file = open(path, "a")
+        self._cond = threading.Condition()
+        # Held while fsyncing or replacing the file, so an fsync never hits a closed one
+        self._file_lock = threading.Lock()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="edit-log-fsync", daemon=True)
+        self._flusher.start()
+
+    @property
+    def last_seq(self) -> int:
+        return self._written
+
+    def _read(self) -> tuple[list[dict], bool]:
+        """Every complete entry, and whether the file ends in a torn write."""
+        try:
+            with open(self.path) as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return [], False
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A write torn by a crash can only be the last line
+                return entries, True
+        return entries, False
+
+    def entries(self, after: int = 0) -> list[dict]:
+        """Logged edits with a sequence number above `after`, oldest first."""
+        return [e for e in self._read()[0] if e["seq"] > after]
+
+    def append(self, edit: dict) -> int:
+        """Queues an edit for writing and returns its sequence number."""
+        with self._cond:
+            seq = self._written + 1
+            self._file.write(json.dumps({"seq": seq, **edit}, separators=(",", ":")) + "\n")
+            self._written = seq
+            self._cond.notify_all()
+        return seq
+
+    def wait_durable(self, seq: int) -> None:
+        """Blocks until the edit numbered `seq` has been fsynced."""
+        with self._cond:
+            while self._synced < seq and not self._closed:
+                self._cond.wait()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._synced == self._written and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                target = self._written
+                self._file.flush()
+            # Outside the condition, so edits keep queueing up for the next batch
+            with self._file_lock:
+                if not self._file.closed:
+                    os.fsync(self._file.fileno())
+            with self._cond:
+                self._synced = max(self._synced, target)
+                self._cond.notify_all()
+            time.sleep(self.flush_interval)
+
+    def compact(self, upto: int) -> None:
+        """Drops the entries up to `upto`, once a persisted snapshot includes them."""
+        with self._file_lock, self._cond:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._synced = self._written
+            tail = self.entries(upto)
+            self._file.close()
+            with atomic_open(self.path, "w") as f:
+                for entry in tail:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._file = open(self.path, "a")
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._file_lock, self._cond:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._synced = self._written
+            self._closed = True
+            self._file.close()
+            self._cond.notify_all()
+        self._flusher.join()
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from editlog import EditLog, apply_edit, restore_sections
+from scheduler import run_pipeline
+from snapshot import SnapshotBuilder, load_snapshot, save_snapshot
+from student import Student, load_student_csv
+from teacher import load_teachers_csv
+
+
+def load_roster():
+    students = {str(s.id): s for s in load_student_csv("data/students.csv")}
+    teachers = {str(t.id): t for t in load_teachers_csv("teachers.csv")}
+    return students, teachers
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = tmp_path / "edits.log"
+    path.write_text('{"seq":1,"op":"move"}\n{"seq":2,"op":"drop"}\n{"seq":3,"op":"mo')
+
+    log = EditLog(str(path))
+    assert [e["seq"] for e in log.entries()] == [1, 2]
+    log.wait_durable(log.append({"op": "enroll"}))
+    log.close()
+
+    assert [json.loads(line)["seq"] for line in path.read_text().splitlines()] == [1, 2, 3]
+
+
+def test_compaction_keeps_the_tail_and_numbering(tmp_path):
+    path = str(tmp_path / "edits.log")
+    log = EditLog(path)
+    for i in range(5):
+        seq = log.append({"op": "move", "timeBlock": i})
+    log.wait_durable(seq)
+
+    log.compact(3)
+    assert [e["seq"] for e in log.entries()] == [4, 5]
+    log.compact(5)
+    assert log.entries() == []
+    log.close()
+
+    # Numbering continues after the persisted snapshot even with an empty log
+    log = EditLog(path, start=5)
+    assert log.append({"op": "move", "timeBlock": 0}) == 6
+    log.close()
+
+
+def test_snapshot_plus_tail_replay_restores_the_schedule(tmp_path):
+    students, teachers = load_roster()
+    sections_list, issues = run_pipeline(list(students.values()), list(teachers.values()))
+    sections = {str(s.get_id()): s for s in sections_list}
+    builder = SnapshotBuilder(sections_list, list(teachers.values()), list(students.values()), issues.all())
+    log = EditLog(str(tmp_path / "edits.log"))
+    snapshot_path = str(tmp_path / "snapshot.json")
+
+    first, second = sections_list[0], sections_list[1]
+    moved_student = first.get_students()[0]
+    edits = [
+        {"op": "move", "section": str(first.get_id()), "timeBlock": 5},
+        {"op": "drop", "section": str(first.get_id()), "student": str(moved_student.id)},
+        # Persisted here; the edits below only live in the log
+        {"op": "move", "section": str(second.get_id()), "timeBlock": 0},
+        {"op": "enroll", "section": str(first.get_id()), "student": str(moved_student.id)},
+    ]
+    version = 1
+    for i, edit in enumerate(edits):
+        section, touched_students, touched_teachers = apply_edit(edit, students, teachers, sections)
+        seq = log.append(edit)
+        builder.touch([section], touched_teachers, touched_students)
+        version += 1
+        published = builder.build(version, seq)
+        if i == 1:
+            save_snapshot(published, snapshot_path)
+            log.compact(seq)
+    log.close()
+
+    # Restart: fresh roster objects, persisted snapshot, replay the tail
+    persisted = load_snapshot(snapshot_path)
+    students, teachers = load_roster()
+    log = EditLog(str(tmp_path / "edits.log"), persisted.edit_seq)
+    sections = restore_sections(persisted, students, teachers)
+    builder = SnapshotBuilder(list(sections.values()), list(teachers.values()), list(students.values()), list(persisted.conflicts))
+    tail = log.entries(persisted.edit_seq)
+    for entry in tail:
+        section, touched_students, touched_teachers = apply_edit(entry, students, teachers, sections)
+        builder.touch([section], touched_teachers, touched_students)
+    restored = builder.build(persisted.version + len(tail), log.last_seq)
+    log.close()
+
+    assert len(tail) == 2
+    assert restored.version == published.version and restored.edit_seq == published.edit_seq
+    for field in ("sections", "teachers", "students", "conflicts", "section_rows", "schedule_rows"):
+        assert getattr(restored, field) == getattr(published, field), field
+
+
+def test_restore_rejects_a_changed_roster(tmp_path):
+    students, teachers = load_roster()
+    sections_list, issues = run_pipeline(list(students.values()), list(teachers.values()))
+    snapshot = SnapshotBuilder(sections_list, list(teachers.values()), list(students.values()), issues.all()).build(1)
+
+    # A student added to the roster since the snapshot
+    students, teachers = load_roster()
+    added = Student("New Student", {"math": 5})
+    students[str(added.id)] = added
+    with pytest.raises(ValueError):
+        restore_sections(snapshot, students, teachers)
+
+    # A student removed since
+    students, teachers = load_roster()
+    students.pop(next(iter(students)))
+    with pytest.raises(ValueError):
+        restore_sections(snapshot, students, teachers)
@@ -0,0 +1,308 @@
+"""
+Streaming exporters for finished schedules.
+
+Records are serialized one at a time as they are produced instead of
+building the full list first. Every file is written to a temporary file
+in the destination directory and renamed into place, so readers only
+ever see a complete export.
+"""
+import csv
+import io
+import json
+import os
+import textwrap
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable
+
+from constants import LEVEL_DICT, TIME_BLOCKS
+from section import Section
+from student import Student
+from teacher import Teacher
+from time_block import TimeBlock
+
+JSON_FORMATS = ("pretty", "compact", "ndjson")
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w", **kwargs):
+    """Opens a temp file next to `path` and renames it over `path` on success."""
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+    f = open(tmp_path, mode.replace("w", "x"), **kwargs)
+    try:
+        with f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_json_records(path: str, records: Iterable[dict], fmt: str = "pretty") -> int:
+    """
+    Streams records to `path` and returns how many were written.
+
+    pretty:  a JSON array indented like json.dump(..., indent=2)
+    compact: a JSON array without whitespace
+    ndjson:  one compact JSON object per line
+    """
+    if fmt not in JSON_FORMATS:
+        raise ValueError(f"Unknown JSON format {fmt!r}, expected one of {JSON_FORMATS}")
+
+    count = 0
+    with atomic_open(path, "w") as f:
+        if fmt == "ndjson":
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")))
+                f.write("\n")
+                count += 1
+            return count
+
+        f.write("[")
+        for record in records:
+            if fmt == "pretty":
+                f.write(",\n" if count else "\n")
+                f.write(textwrap.indent(json.dumps(record, indent=2), "  "))
+            else:
+                f.write("," if count else "")
+                f.write(json.dumps(record, separators=(",", ":")))
+            count += 1
+        f.write("\n]" if fmt == "pretty" and count else "]")
+    return count
+
+
+def export_schedule_json(sections: list[Section],
+                         teachers: list[Teacher],
+                         students: list[Student],
+                         out_dir: str = ".",
+                         fmt: str = "pretty") -> dict[str, int]:
+    """
+    Writes sections, teachers and students into out_dir concurrently.
+    Files are named <kind>.json, or <kind>.ndjson in ndjson mode.
+    Returns the number of records written per file.
+    """
+    ext = ".ndjson" if fmt == "ndjson" else ".json"
+    jobs = {
+        "sections": (s.to_json() for s in sections),
+        "teachers": (t.to_json() for t in teachers),
+        "students": (s.to_json() for s in students),
+    }
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = {
+            name: pool.submit(write_json_records, os.path.join(out_dir, name + ext), records, fmt)
+            for name, records in jobs.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+# -------------------------------------------------
+# CSV
+# -------------------------------------------------
+
+SECTION_CSV_HEADER = ["Subject", "Level", "Time", "Days", "Teacher", "Students"]
+STUDENT_SCHEDULE_CSV_HEADER = ["Student", "Subject", "Level", "Teacher", "Start", "End"]
+
+
+def section_csv_rows(sections: Iterable[Section]):
+    """Yields one row per section."""
+    for section in sections:
+        teacher = section.get_teacher()
+        yield [
+            section.get_subject(),
+            section.get_level(),
+            str(section.get_time()),
+            section.get_days(),
+            teacher.name if teacher else "Unassigned",
+            " | ".join(str(student) for student in section.get_students())
+        ]
+
+
+def student_schedule_csv_rows(students: Iterable[Student]):
+    """Yields one row per student enrollment."""
+    for student in students:
+        for section in student.get_schedule():
+            teacher = section.get_teacher()
+            block = section.get_time()
+            yield [
+                student.name,
+                section.get_subject(),
+                LEVEL_DICT.get(section.get_level(), section.get_level()),
+                teacher.name if teacher else "Unassigned",
+                block.start if block else "",
+                block.end if block else ""
+            ]
+
+
+def write_csv_rows(path: str, header: list[str], rows: Iterable[list]) -> int:
+    """Streams rows to `path` atomically and returns how many were written."""
+    count = 0
+    with atomic_open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def iter_csv_chunks(header: list[str], rows: Iterable[list], rows_per_chunk: int = 1000):
+    """Yields the CSV as encoded chunks, e.g. for a StreamingResponse."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if i % rows_per_chunk == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode()
+
+
+def export_sections_csv(sections: Iterable[Section], path: str) -> int:
+    return write_csv_rows(path, SECTION_CSV_HEADER, section_csv_rows(sections))
+
+
+def export_student_schedules_csv(students: Iterable[Student], path: str) -> int:
+    return write_csv_rows(path, STUDENT_SCHEDULE_CSV_HEADER, student_schedule_csv_rows(students))
+
+
+# -------------------------------------------------
+# Columnar (Parquet / .npz)
+# -------------------------------------------------
+
+class DictColumn:
+    """A dictionary-encoded column: integer codes into a list of values, -1 for null."""
+
+    def __init__(self, codes: list[int], dictionary: list[str]):
+        self.codes = codes
+        self.dictionary = dictionary
+
+
+def schedule_tables(sections: list[Section],
+                    teachers: list[Teacher],
+                    students: list[Student],
+                    time_blocks: list[TimeBlock] = TIME_BLOCKS) -> dict[str, dict[str, list | DictColumn]]:
+    """
+    Flattens a schedule into sections, enrollments, students, teachers
+    and time_blocks tables keyed by integer ids (list positions).
+    """
+    teacher_keys = {id(t): i for i, t in enumerate(teachers)}
+    student_keys = {id(s): i for i, s in enumerate(students)}
+    block_keys = {block: i for i, block in enumerate(time_blocks)}
+    subjects = sorted({s.get_subject() for s in sections})
+    subject_keys = {subject: i for i, subject in enumerate(subjects)}
+    teacher_names = [t.name for t in teachers]
+
+    section_table = {"id": [], "uuid": [], "subject": [], "level": [], "teacher": [], "time_block": [], "days": []}
+    enrollment_table = {"section_id": [], "student_id": []}
+
+    for key, section in enumerate(sections):
+        teacher = section.get_teacher()
+        section_table["id"].append(key)
+        section_table["uuid"].append(str(section.get_id()))
+        section_table["subject"].append(subject_keys[section.get_subject()])
+        section_table["level"].append(section.get_level())
+        section_table["teacher"].append(teacher_keys.get(id(teacher), -1))
+        section_table["time_block"].append(block_keys.get(section.get_time(), -1))
+        section_table["days"].append(section.get_days() or "")
+
+        for student in section.get_students():
+            enrollment_table["section_id"].append(key)
+            enrollment_table["student_id"].append(student_keys[id(student)])
+
+    section_table["subject"] = DictColumn(section_table["subject"], subjects)
+    section_table["teacher"] = DictColumn(section_table["teacher"], teacher_names)
+
+    return {
+        "sections": section_table,
+        "enrollments": enrollment_table,
+        "students": {
+            "id": list(range(len(students))),
+            "uuid": [str(s.id) for s in students],
+            "name": [s.name for s in students],
+        },
+        "teachers": {
+            "id": list(range(len(teachers))),
+            "uuid": [str(t.id) for t in teachers],
+            "name": teacher_names,
+            "sections": [t.sections for t in teachers],
+            "is_mentor": [t.is_mentor for t in teachers],
+        },
+        "time_blocks": {
+            "id": list(range(len(time_blocks))),
+            "start": [b.start for b in time_blocks],
+            "end": [b.end for b in time_blocks],
+            "days": [b.days for b in time_blocks],
+        },
+    }
+
+
+def _write_parquet(tables: dict, out_dir: str) -> list[str]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    paths = []
+    for name, columns in tables.items():
+        arrays = {}
+        for col, values in columns.items():
+            if isinstance(values, DictColumn):
+                codes = pa.array(values.codes, pa.int32(), mask=[c < 0 for c in values.codes])
+                arrays[col] = pa.DictionaryArray.from_arrays(codes, pa.array(values.dictionary, pa.string()))
+            else:
+                arrays[col] = pa.array(values)
+
+        path = os.path.join(out_dir, name + ".parquet")
+        with atomic_open(path, "wb") as f:
+            pq.write_table(pa.table(arrays), f)
+        paths.append(path)
+    return paths
+
+
+def _write_npz(tables: dict, out_dir: str) -> list[str]:
+    """
+    Writes every column into one schedule.npz as "<table>.<column>".
+    Dictionary columns store their codes there and their values under
+    "<table>.<column>.dictionary".
+    """
+    import numpy as np
+
+    arrays = {}
+    for name, columns in tables.items():
+        for col, values in columns.items():
+            if isinstance(values, DictColumn):
+                arrays[f"{name}.{col}"] = np.asarray(values.codes, dtype=np.int32)
+                arrays[f"{name}.{col}.dictionary"] = np.asarray(values.dictionary, dtype=str)
+            elif values and isinstance(values[0], str):
+                arrays[f"{name}.{col}"] = np.asarray(values, dtype=str)
+            else:
+                arrays[f"{name}.{col}"] = np.asarray(values)
+
+    path = os.path.join(out_dir, "schedule.npz")
+    with atomic_open(path, "wb") as f:
+        np.savez(f, **arrays)
+    return [path]
+
+
+def export_schedule_columnar(sections: list[Section],
+                             teachers: list[Teacher],
+                             students: list[Student],
+                             out_dir: str,
+                             time_blocks: list[TimeBlock] = TIME_BLOCKS) -> list[str]:
+    """
+    Writes the schedule as columnar tables into out_dir: one Parquet file
+    per table when pyarrow is installed, otherwise a single schedule.npz.
+    Returns the written paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tables = schedule_tables(sections, teachers, students, time_blocks)
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return _write_npz(tables, out_dir)
+    return _write_parquet(tables, out_dir)
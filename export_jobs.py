@@ -0,0 +1,82 @@
+"""
+Background CSV export jobs.
+
+Jobs run on a bounded thread pool against an immutable ScheduleSnapshot
+and write to file names that include the schedule version, so
+concurrent exports never share a path. A job is identified by
+(version, kind): requesting the same export again while it is running,
+or after it finished, returns the existing job instead of starting a
+new one.
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from export import SECTION_CSV_HEADER, STUDENT_SCHEDULE_CSV_HEADER, write_csv_rows
+from snapshot import ScheduleSnapshot
+
+EXPORT_KINDS = {
+    "sections": ("final_sections", SECTION_CSV_HEADER, "section_rows"),
+    "schedules": ("student_schedules", STUDENT_SCHEDULE_CSV_HEADER, "schedule_rows"),
+}
+
+
+class ExportJobs:
+    def __init__(self, out_dir: str = "out/exports", max_workers: int = 2, keep_versions: int = 3):
+        self.out_dir = out_dir
+        self.keep_versions = keep_versions
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._jobs: dict[tuple[int, str], Future] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, version: int, kind: str) -> str:
+        prefix = EXPORT_KINDS[kind][0]
+        return os.path.join(self.out_dir, f"{prefix}-v{version}.csv")
+
+    def submit(self, snapshot: ScheduleSnapshot, kind: str) -> Future:
+        """Starts (or joins) the export of `kind` for the snapshot's version."""
+        if kind not in EXPORT_KINDS:
+            raise ValueError(f"Unknown export kind {kind!r}")
+
+        key = (snapshot.version, kind)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or (job.done() and job.exception() is not None):
+                job = self._jobs[key] = self._pool.submit(self._run, snapshot, kind)
+                self._prune(snapshot.version)
+        return job
+
+    def get(self, version: int, kind: str) -> Future | None:
+        return self._jobs.get((version, kind))
+
+    def status(self, version: int, kind: str) -> str:
+        job = self.get(version, kind)
+        if job is None:
+            return "missing"
+        if not job.done():
+            return "running"
+        return "failed" if job.exception() is not None else "done"
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _run(self, snapshot: ScheduleSnapshot, kind: str) -> str:
+        _, header, rows_attr = EXPORT_KINDS[kind]
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = self.path_for(snapshot.version, kind)
+        write_csv_rows(path, header, getattr(snapshot, rows_attr))
+        return path
+
+    def _prune(self, newest: int) -> None:
+        """Forgets jobs (and deletes files) older than the last keep_versions versions."""
+        for version, kind in list(self._jobs):
+            if version > newest - self.keep_versions:
+                continue
+            job = self._jobs[(version, kind)]
+            if not job.done():
+                continue
+            del self._jobs[(version, kind)]
+            try:
+                os.remove(self.path_for(version, kind))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,70 @@
+import os
+import threading
+
+import pytest
+
+from export_jobs import ExportJobs
+from snapshot import ScheduleSnapshot
+
+
+def snapshot(version: int) -> ScheduleSnapshot:
+    row = ("math", "Beginner", "Start: 800 End: 900", "MTWRF", "Nathan", "Ada")
+    return ScheduleSnapshot(version, (), (), (), (), (row,), ())
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    jobs = ExportJobs(str(tmp_path), keep_versions=2)
+    yield jobs
+    jobs.shutdown()
+
+
+def test_requests_for_a_running_export_share_one_job(jobs, monkeypatch):
+    release = threading.Event()
+    runs = []
+    original = jobs._run
+
+    def slow_run(snap, kind):
+        runs.append((snap.version, kind))
+        release.wait(5)
+        return original(snap, kind)
+
+    monkeypatch.setattr(jobs, "_run", slow_run)
+    first = jobs.submit(snapshot(1), "sections")
+    assert jobs.submit(snapshot(1), "sections") is first
+    assert jobs.status(1, "sections") == "running"
+    release.set()
+    path = first.result(5)
+
+    # Finished jobs are reused too; another kind or version is a new job
+    assert jobs.submit(snapshot(1), "sections") is first
+    assert jobs.submit(snapshot(1), "schedules") is not first
+    jobs.submit(snapshot(2), "sections").result(5)
+    assert runs == [(1, "sections"), (1, "schedules"), (2, "sections")]
+    assert jobs.status(1, "sections") == "done"
+    assert open(path).read().splitlines()[0] == "Subject,Level,Time,Days,Teacher,Students"
+
+
+def test_a_failed_export_is_retried(jobs, monkeypatch):
+    original = jobs._run
+    monkeypatch.setattr(jobs, "_run", lambda snap, kind: 1 / 0)
+    failed = jobs.submit(snapshot(1), "sections")
+    with pytest.raises(ZeroDivisionError):
+        failed.result(5)
+    assert jobs.status(1, "sections") == "failed"
+
+    monkeypatch.setattr(jobs, "_run", original)
+    retried = jobs.submit(snapshot(1), "sections")
+    assert retried is not failed
+    retried.result(5)
+    assert jobs.status(1, "sections") == "done"
+
+
+def test_old_versions_are_pruned(jobs):
+    old = jobs.submit(snapshot(1), "sections").result(5)
+    jobs.submit(snapshot(2), "sections").result(5)
+    jobs.submit(snapshot(3), "sections").result(5)
+
+    assert jobs.status(1, "sections") == "missing"
+    assert not os.path.exists(old)
+    assert jobs.status(2, "sections") == jobs.status(3, "sections") == "done"
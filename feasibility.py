@@ -0,0 +1,143 @@
+"""
+Cheap lower bounds that prove a schedule can't fit in the time blocks.
+
+Every pair of sections joined in the conflict graph needs different
+blocks, so any clique larger than the number of blocks is impossible to
+color. A teacher's or a student's sections always form a clique, which
+makes per-person section counts the cheapest bound. Teachers can have
+a tighter one: their back-to-back limit may leave them fewer usable
+blocks (see consecutive.py). A greedy clique search over the graph
+catches the rest. With a room limit per block, there also can't be more
+sections than rooms times the most blocks one room can hold, since a
+room is shared by overlapping blocks.
+"""
+from dataclasses import dataclass, field
+
+from consecutive import ConsecutiveLimit
+from section import Section
+from student import Student
+from teacher import Teacher
+
+
+@dataclass
+class InfeasibilityReport:
+    blocks: int
+    # name -> (sections, usable blocks), for teachers with more sections than usable blocks
+    teachers: dict[str, tuple[int, int]] = field(default_factory=dict)
+    # name -> sections, for students with more sections than blocks
+    students: dict[str, int] = field(default_factory=dict)
+    # mutually conflicting sections (by id) too many to fit in the blocks
+    cliques: list[list[str]] = field(default_factory=list)
+    # sections that don't fit in the rooms, given which blocks overlap
+    room_shortfall: int = 0
+
+    @property
+    def feasible(self) -> bool:
+        return not (self.teachers or self.students or self.cliques or self.room_shortfall)
+
+    def issues(self) -> list[str]:
+        issues = [
+            f"Infeasible: teacher {name} has {count} sections but there are only {self.blocks} time blocks"
+            if usable == self.blocks else
+            f"Infeasible: teacher {name} has {count} sections but their back-to-back limit allows only {usable} blocks"
+            for name, (count, usable) in self.teachers.items()
+        ]
+        issues += [
+            f"Infeasible: student {name} has {count} sections but there are only {self.blocks} time blocks"
+            for name, count in self.students.items()
+        ]
+        issues += [
+            f"Infeasible: {len(clique)} mutually conflicting sections but only {self.blocks} time blocks "
+            f"({', '.join(clique)})"
+            for clique in self.cliques
+        ]
+        if self.room_shortfall:
+            issues.append(f"Infeasible: {self.room_shortfall} sections more than the rooms in {self.blocks} time blocks")
+        return issues
+
+    def to_json(self) -> dict:
+        return {
+            "feasible": self.feasible,
+            "blocks": self.blocks,
+            "teachers": {name: {"sections": count, "blocks": usable} for name, (count, usable) in self.teachers.items()},
+            "students": self.students,
+            "cliques": self.cliques,
+            "roomShortfall": self.room_shortfall,
+        }
+
+
+class InfeasibleScheduleError(RuntimeError):
+    def __init__(self, report: InfeasibilityReport):
+        super().__init__("; ".join(report.issues()))
+        self.report = report
+
+
+def greedy_clique(section: Section, conflicts: dict[Section, set[Section]]) -> list[Section]:
+    """
+    Grows a clique from `section`, adding its most connected neighbors
+    first as long as they conflict with every section already in it.
+    """
+    clique = [section]
+    candidates = set(conflicts[section])
+
+    for neighbor in sorted(conflicts[section], key=lambda s: len(conflicts[s]), reverse=True):
+        if neighbor in candidates:
+            clique.append(neighbor)
+            candidates &= conflicts[neighbor]
+
+    return clique
+
+
+def check_feasibility(
+    sections_list: list[Section],
+    students_list: list[Student],
+    teachers_list: list[Teacher],
+    conflicts: dict[Section, set[Section]],
+    blocks: int,
+    limits: ConsecutiveLimit | None = None,
+    block_capacity: int | None = None
+) -> InfeasibilityReport:
+    """
+    Checks the lower bounds against `blocks` time blocks and, when given,
+    the teachers' back-to-back limits and the rooms per block. Cliques made of one teacher's or
+    one student's sections are already reported by name, so only the ones
+    that span several people are listed.
+    """
+    report = InfeasibilityReport(blocks)
+    if block_capacity is not None:
+        # Without the blocks themselves, assume none of them overlap
+        per_room = limits.model.max_disjoint if limits else blocks
+        report.room_shortfall = max(0, len(sections_list) - per_room * block_capacity)
+
+    for teacher in teachers_list:
+        usable = min(blocks, limits.max_blocks(teacher.max_consecutive)) if limits else blocks
+        if len(teacher.schedule) > usable:
+            report.teachers[teacher.name] = (len(teacher.schedule), usable)
+    for student in students_list:
+        if len(student.get_schedule()) > blocks:
+            report.students[student.name] = len(student.get_schedule())
+
+    explained = [
+        set(map(id, t.schedule)) for t in teachers_list if t.name in report.teachers
+    ] + [
+        set(map(id, s.get_schedule())) for s in students_list if s.name in report.students
+    ]
+
+    seen = set()
+    for section in sorted(sections_list, key=lambda s: len(conflicts[s]), reverse=True):
+        # A clique is at most a section plus its neighbors; past here none can be too big
+        if len(conflicts[section]) < blocks:
+            break
+        if id(section) in seen:
+            continue
+
+        clique = greedy_clique(section, conflicts)
+        if len(clique) <= blocks:
+            continue
+        members = set(map(id, clique))
+        seen |= members
+        if any(members <= people for people in explained):
+            continue
+        report.cliques.append([str(s.get_id()) for s in clique])
+
+    return report
@@ -0,0 +1,26 @@
+from consecutive import ConsecutiveLimit
+from feasibility import check_feasibility
+from section import Section
+from time_block import TimeBlock, time_model
+
+# Two morning blocks that overlap on Mondays, and an afternoon block
+MORNING = [TimeBlock(800, 930, "MWF"), TimeBlock(900, 1030, "MR")]
+BLOCKS = MORNING + [TimeBlock(1300, 1400)]
+
+
+def test_max_disjoint_counts_overlapping_blocks_once():
+    assert time_model(BLOCKS).max_disjoint == 2
+    assert time_model(MORNING[:1] + [TimeBlock(900, 1030, "TR")]).max_disjoint == 2
+
+
+def test_rooms_are_shared_by_overlapping_blocks():
+    sections = [Section("math", 0) for _ in range(5)]
+    conflicts = {section: set() for section in sections}
+
+    # Two rooms hold four sections at most: one room can't use both morning blocks
+    report = check_feasibility(sections, [], [], conflicts, len(BLOCKS), ConsecutiveLimit(BLOCKS), block_capacity=2)
+    assert report.room_shortfall == 1
+    assert not report.feasible
+
+    report = check_feasibility(sections[:4], [], [], conflicts, len(BLOCKS), ConsecutiveLimit(BLOCKS), block_capacity=2)
+    assert report.feasible
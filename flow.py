@@ -0,0 +1,55 @@
+from collections import defaultdict, deque
+
+
+class FlowNetwork:
+    """
+    A small max-flow network (Edmonds-Karp). Flow found by one max_flow
+    call is kept, so edges added afterwards only augment it; this is how
+    preferred edges get filled before fallback ones.
+    """
+    def __init__(self):
+        self.original = defaultdict(lambda: defaultdict(int))
+        self.residual = defaultdict(lambda: defaultdict(int))
+
+    def add_edge(self, u, v, capacity: int) -> None:
+        self.original[u][v] += capacity
+        self.residual[u][v] += capacity
+        self.residual[v][u] += 0
+
+    def _augmenting_path(self, source, sink) -> dict | None:
+        parent = {source: None}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for v, capacity in self.residual[u].items():
+                if capacity > 0 and v not in parent:
+                    parent[v] = u
+                    if v == sink:
+                        return parent
+                    queue.append(v)
+        return None
+
+    def max_flow(self, source, sink) -> int:
+        """Augments until no path is left and returns the flow added."""
+        total = 0
+        while (parent := self._augmenting_path(source, sink)) is not None:
+            bottleneck = None
+            v = sink
+            while parent[v] is not None:
+                u = parent[v]
+                c = self.residual[u][v]
+                bottleneck = c if bottleneck is None else min(bottleneck, c)
+                v = u
+
+            v = sink
+            while parent[v] is not None:
+                u = parent[v]
+                self.residual[u][v] -= bottleneck
+                self.residual[v][u] += bottleneck
+                v = u
+            total += bottleneck
+        return total
+
+    def flow(self, u, v) -> int:
+        """Flow currently routed over the edge u -> v."""
+        return max(0, self.original[u][v] - self.residual[u][v])
@@ -0,0 +1,81 @@
+from bucket import Bucket
+from flow import FlowNetwork
+from scheduler import plan_sections
+from student import Student
+from teacher import Teacher
+
+
+def bucket(subject: str, level: int, *students: Student) -> Bucket:
+    result = Bucket(level, subject)
+    for student in students:
+        result.add_student(student)
+    return result
+
+
+def students(prefix: str, count: int, **scores) -> list[Student]:
+    return [Student(f"{prefix}{i}", dict(scores)) for i in range(count)]
+
+
+def test_max_flow_keeps_earlier_flow():
+    network = FlowNetwork()
+    network.add_edge("source", "a", 2)
+    network.add_edge("source", "b", 2)
+    network.add_edge("a", "sink", 1)
+    assert network.max_flow("source", "sink") == 1
+
+    # Only the new edge's flow is added on the second call
+    network.add_edge("b", "sink", 3)
+    assert network.max_flow("source", "sink") == 2
+    assert network.flow("a", "sink") == 1
+    assert network.flow("b", "sink") == 2
+    assert network.max_flow("source", "sink") == 0
+
+
+def test_preferred_teachers_fill_before_fallback_ones():
+    preferred = Teacher({"math": 1}, 2, "Preferred")
+    fallback = Teacher({"math": 0}, 2, "Fallback")
+    teachers = [fallback, preferred]
+
+    # Two sections needed: the preferred teacher covers both
+    plan = plan_sections([bucket("math", 0, *students("M", 4, math=1))], teachers, class_limit=2)
+    assert plan.quotas[str(preferred.id)]["math"] == 2
+    assert plan.quotas[str(fallback.id)]["math"] == 0
+
+    # Three needed: the fallback teacher only takes what's left
+    plan = plan_sections([bucket("math", 0, *students("M", 6, math=1))], teachers, class_limit=2)
+    assert plan.quotas[str(preferred.id)]["math"] == 2
+    assert plan.quotas[str(fallback.id)]["math"] == 1
+
+
+def test_quotas_add_up_to_the_planned_sections():
+    teachers = [
+        Teacher({"math": 1, "english": 0}, 3, "A"),
+        Teacher({"english": 1}, 1, "B"),
+        Teacher({"math": 0, "english": 1}, 2, "C"),
+    ]
+    buckets = [
+        bucket("math", 0, *students("M0-", 5, math=1)),
+        bucket("math", 2, *students("M2-", 3, math=8)),
+        bucket("english", 1, *students("E1-", 7, english=5)),
+    ]
+    plan = plan_sections(buckets, teachers, class_limit=2)
+
+    for subject in ("math", "english"):
+        planned = sum(n for (s, _), n in plan.sections.items() if s == subject)
+        assigned = sum(quota[subject] for quota in plan.quotas.values())
+        assert assigned == plan.supply[subject] == planned
+    # Six teachable sections for the nine needed
+    assert sum(plan.sections.values()) == 6
+
+
+def test_overflow_goes_to_the_smaller_bucket_first():
+    teacher = Teacher({"math": 1}, 1, "Only")
+    # Same math level, sorted by their english level within the bucket
+    big = [Student(f"Big{i}", {"math": 1, "english": score}) for i, score in enumerate((8, 1, 5))]
+    small = students("Small", 1, math=8, english=1)
+    plan = plan_sections([bucket("math", 0, *big), bucket("math", 2, *small)], [teacher], class_limit=2)
+
+    assert plan.sections == {("math", 0): 1, ("math", 2): 0}
+    assert plan.overflow[("math", 0)] == [big[0]]
+    assert plan.overflow[("math", 2)] == small
+    assert len(plan.overflow_issues()) == 2
@@ -0,0 +1,140 @@
+"""
+Seeded synthetic roster generator.
+
+Writes student and teacher CSVs in the same formats read by
+load_student_csv and load_teachers_csv, so any roster size can be fed
+through the scheduler:
+
+    python generate.py --students 10000 --seed 1 --out-dir out/generated
+"""
+import argparse
+import csv
+import math
+import os
+import random
+
+from consecutive import ConsecutiveLimit
+from constants import CLASS_LIMIT, MAX_CONSECUTIVE, TIME_BLOCKS
+
+FIRST_NAMES = [
+    "Jackie", "Diana", "Odell", "Jadon", "Skye", "Kaya", "Milo", "Ava",
+    "Theo", "Nora", "Ezra", "Iris", "Leo", "Maya", "Finn", "Ruth"
+]
+LAST_NAMES = [
+    "Abbott", "Lemke", "Padberg", "Gleason", "Braun", "Robel", "Hayes",
+    "Ortiz", "Kim", "Novak", "Reyes", "Singh", "Walsh", "Okafor"
+]
+
+# (mean, standard deviation, chance of a missing score) per subject.
+# Scores are clipped to 1-10; a missing score is written as 0.
+STUDENT_SCORE_DISTRIBUTIONS = {
+    "english": (5.5, 2.5, 0.02),
+    "math": (5.0, 2.5, 0.02),
+    "asl": (4.0, 2.5, 0.05),
+}
+
+# Chance of a weight of (-1, 0, 1) for each subject a teacher is listed with.
+TEACHER_SUBJECT_WEIGHTS = {
+    "ASL": (0.6, 0.2, 0.2),
+    "Math": (0.4, 0.3, 0.3),
+    "English": (0.4, 0.3, 0.3),
+    "College Readiness": (0.5, 0.3, 0.2),
+    "Digital Lit": (0.5, 0.3, 0.2),
+    "Financial Lit": (0.5, 0.3, 0.2),
+    "Presentations": (0.5, 0.3, 0.2),
+    "Social Emotional Learning": (0.5, 0.3, 0.2),
+}
+
+# Chance of each section cap per teacher.
+TEACHER_SECTION_CAPS = {4: 0.1, 5: 0.2, 6: 0.7}
+
+
+def _score(rng: random.Random, mean: float, stddev: float, missing: float) -> int:
+    if rng.random() < missing:
+        return 0
+    return min(10, max(1, round(rng.gauss(mean, stddev))))
+
+
+def generate_student_rows(count: int, seed: int = 0, distributions: dict = None):
+    """Yields (name, english, math, asl) rows."""
+    distributions = distributions or STUDENT_SCORE_DISTRIBUTIONS
+    rng = random.Random(seed)
+
+    for i in range(count):
+        # The index keeps names unique; Student equality is name based
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+        yield (
+            name,
+            _score(rng, *distributions["english"]),
+            _score(rng, *distributions["math"]),
+            _score(rng, *distributions["asl"]),
+        )
+
+
+def default_teacher_count(student_count: int) -> int:
+    """Roughly enough teachers to cover three subjects per student."""
+    sections_needed = math.ceil(student_count * 3 / CLASS_LIMIT)
+    # The back-to-back limit can leave a teacher fewer blocks than their section
+    # cap, and a quarter of the capacity is spare since not everyone teaches every subject
+    per_teacher = min(5, ConsecutiveLimit(TIME_BLOCKS).max_blocks(MAX_CONSECUTIVE))
+    return max(6, math.ceil(sections_needed / (per_teacher * 0.75)))
+
+
+def generate_teacher_rows(
+    count: int,
+    seed: int = 0,
+    subject_weights: dict = None,
+    section_caps: dict = None
+):
+    """Yields (teacher, class, weight, sections) rows, one per subject."""
+    subject_weights = subject_weights or TEACHER_SUBJECT_WEIGHTS
+    section_caps = section_caps or TEACHER_SECTION_CAPS
+    rng = random.Random(seed)
+    caps, cap_weights = zip(*section_caps.items())
+
+    for i in range(count):
+        name = f"Teacher{i}"
+        sections = rng.choices(caps, cap_weights)[0]
+        for subject, weights in subject_weights.items():
+            weight = rng.choices((-1, 0, 1), weights)[0]
+            yield (name, subject, weight, sections)
+
+
+def write_students_csv(file_name: str, count: int, seed: int = 0) -> None:
+    with open(file_name, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Student Name", "Reading Ability Level", "Math Ability Level", "ASL Ability Level"])
+        writer.writerows(generate_student_rows(count, seed))
+
+
+def write_teachers_csv(file_name: str, count: int, seed: int = 0) -> None:
+    with open(file_name, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Teacher", "Class", "Weight", "Sections"])
+        writer.writerows(generate_teacher_rows(count, seed))
+
+
+def generate_roster(out_dir: str, students: int, teachers: int = 0, seed: int = 0) -> tuple[str, str]:
+    """
+    Writes students.csv and teachers.csv into out_dir and returns their paths.
+    A teacher count of 0 picks one based on the number of students.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    students_path = os.path.join(out_dir, "students.csv")
+    teachers_path = os.path.join(out_dir, "teachers.csv")
+
+    write_students_csv(students_path, students, seed)
+    write_teachers_csv(teachers_path, teachers or default_teacher_count(students), seed)
+    return students_path, teachers_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic roster.")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--teachers", type=int, default=0, help="0 scales with --students")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default="out/generated")
+    args = parser.parse_args()
+
+    paths = generate_roster(args.out_dir, args.students, args.teachers, args.seed)
+    print("Wrote", *paths)
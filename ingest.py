@@ -0,0 +1,272 @@
+"""
+Streaming bulk upserts of students (POST /students:bulk).
+
+The body is read and applied CHUNK_ROWS lines at a time, so an upload
+of any size only ever holds one chunk in memory. Two formats:
+
+CSV, with an external id column and a name column in any position and
+every other column a subject, as in data/students.csv:
+
+    ExternalId,Name,Math Ability Level,Reading Ability Level
+    s-1,Ada,7,4
+
+NDJSON, one student per line:
+
+    {"externalId": "s-1", "name": "Ada", "scores": {"math": 7, "reading": 4}}
+
+Each chunk's scores become one ScoreTable, like a CSV loaded at startup.
+A student whose external id is already on the roster is updated in
+place (keeping their seats in the current schedule until the next run);
+anyone else is added. Bad rows are skipped and reported by line number.
+Quoted CSV fields can't contain line breaks.
+
+Applied rows are also appended to a RosterJournal (as NDJSON, fsynced
+before they're applied), which startup replays over data/students.csv so
+uploaded students survive a restart.
+"""
+import codecs
+import csv
+import json
+import os
+import threading
+from typing import AsyncIterator
+
+import numpy as np
+
+from export import atomic_open
+from student import ScoreTable, Student, external_student_id, subject_from_header
+
+CHUNK_ROWS = 2000
+# Errors listed in the response; the rest are only counted
+MAX_ERRORS = 1000
+MAX_SCORE = int(np.iinfo(np.int16).max)
+
+BULK_FORMATS = ("csv", "ndjson")
+ID_HEADERS = ("externalid", "external id", "external_id", "id")
+
+
+async def iter_line_chunks(stream: AsyncIterator[bytes], size: int = CHUNK_ROWS) -> AsyncIterator[list[str]]:
+    """Splits a byte stream into lists of up to `size` decoded lines."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    partial = ""
+    lines = []
+    async for data in stream:
+        text = partial + decoder.decode(data)
+        *complete, partial = text.split("\n")
+        for line in complete:
+            lines.append(line.rstrip("\r"))
+            if len(lines) == size:
+                yield lines
+                lines = []
+    partial += decoder.decode(b"", final=True)
+    if partial:
+        lines.append(partial.rstrip("\r"))
+    if lines:
+        yield lines
+
+
+def _score(value) -> int:
+    """A score as an int, or ValueError. Empty CSV cells count as 0, as in load_student_csv."""
+    if value == "" or value is None:
+        return 0
+    try:
+        if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+            raise ValueError
+        score = int(value)
+    except (ValueError, TypeError):
+        raise ValueError(f"score {value!r} is not a whole number")
+    if not 0 <= score <= MAX_SCORE:
+        raise ValueError(f"score {score} is out of range 0-{MAX_SCORE}")
+    return score
+
+
+class BulkUpsert:
+    def __init__(self, students: dict[str, Student], fmt: str):
+        if fmt not in BULK_FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}, expected one of {BULK_FORMATS}")
+        self.students = students
+        self.fmt = fmt
+        self.lines = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+        # CSV layout, from the header line
+        self._id_column: int | None = None
+        self._name_column: int | None = None
+        self._subjects: list[tuple[int, str]] = []
+
+    def _error(self, line: int, message: str, external_id=None) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({"line": line, "externalId": external_id, "error": message})
+
+    def _read_header(self, fields: list[str]) -> None:
+        names = [field.strip().lower() for field in fields]
+        ids = [i for i, name in enumerate(names) if name in ID_HEADERS]
+        if not ids:
+            raise ValueError(f"CSV header needs an external id column (one of {', '.join(ID_HEADERS)})")
+        self._id_column = ids[0]
+        self._name_column = names.index("name") if "name" in names else None
+        self._subjects = [
+            (i, subject_from_header(field))
+            for i, field in enumerate(fields)
+            if i not in (self._id_column, self._name_column)
+        ]
+
+    def _parse_csv(self, lines: list[tuple[int, str]]) -> list[tuple[int, str, str, dict]]:
+        rows = []
+        for (line, _), fields in zip(lines, csv.reader(text for _, text in lines)):
+            if self._id_column is None:
+                self._read_header(fields)
+                continue
+            external_id = fields[self._id_column].strip() if self._id_column < len(fields) else ""
+            if not external_id:
+                self._error(line, "missing external id")
+                continue
+            try:
+                scores = {subject: _score(fields[i].strip() if i < len(fields) else "") for i, subject in self._subjects}
+            except ValueError as e:
+                self._error(line, str(e), external_id)
+                continue
+            name = fields[self._name_column].strip() if self._name_column is not None and self._name_column < len(fields) else ""
+            rows.append((line, external_id, name or "Unknown", scores))
+        return rows
+
+    def _parse_ndjson(self, lines: list[tuple[int, str]]) -> list[tuple[int, str, str, dict]]:
+        rows = []
+        for line, text in lines:
+            try:
+                record = json.loads(text)
+            except json.JSONDecodeError as e:
+                self._error(line, f"invalid JSON: {e.msg}")
+                continue
+            if not isinstance(record, dict):
+                self._error(line, "expected a JSON object")
+                continue
+            external_id = record.get("externalId")
+            if external_id is None or str(external_id).strip() == "":
+                self._error(line, "missing externalId")
+                continue
+            external_id = str(external_id).strip()
+            scores = record.get("scores", {})
+            if not isinstance(scores, dict):
+                self._error(line, "scores must be an object of subject: score", external_id)
+                continue
+            try:
+                scores = {subject_from_header(subject): _score(value) for subject, value in scores.items()}
+            except (ValueError, TypeError) as e:
+                self._error(line, str(e), external_id)
+                continue
+            rows.append((line, external_id, str(record.get("name") or "Unknown"), scores))
+        return rows
+
+    def parse(self, lines: list[str]) -> list[tuple[int, str, str, dict]]:
+        """Validates a chunk of lines into (line, external id, name, scores) rows."""
+        numbered = []
+        for text in lines:
+            self.lines += 1
+            if text.strip():
+                numbered.append((self.lines, text))
+        if self.fmt == "csv":
+            return self._parse_csv(numbered)
+        return self._parse_ndjson(numbered)
+
+    def apply(self, rows: list[tuple[int, str, str, dict]]) -> None:
+        """
+        Adds or updates the students of one parsed chunk, sharing one
+        ScoreTable. Readers of the roster must hold the same lock as the
+        caller (see ingest), since an update sets table and column apart.
+        """
+        if not rows:
+            return
+        subjects = list(dict.fromkeys(subject for *_, scores in rows for subject in scores))
+        scores = np.zeros((len(subjects), len(rows)), dtype=np.int16)
+        index = {subject: i for i, subject in enumerate(subjects)}
+        for j, (*_, row_scores) in enumerate(rows):
+            for subject, score in row_scores.items():
+                scores[index[subject], j] = score
+        table = ScoreTable(subjects, scores)
+
+        for j, (_, external_id, name, _) in enumerate(rows):
+            key = str(external_student_id(external_id))
+            student = self.students.get(key)
+            if student is None:
+                self.students[key] = Student(name, table=table, column=j, external_id=external_id)
+                self.created += 1
+            else:
+                student.name = name
+                student.table = table
+                student.column = j
+                self.updated += 1
+
+    def ingest(self, lines: list[str], lock: threading.Lock, journal: "RosterJournal | None" = None) -> None:
+        """Parses a chunk, then journals and applies it while holding `lock`."""
+        rows = self.parse(lines)
+        with lock:
+            if journal is not None:
+                journal.append(rows)
+            self.apply(rows)
+
+    def report(self) -> dict:
+        return {
+            "lines": self.lines,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errorsTruncated": self.failed > len(self.errors)
+        }
+
+
+def _journal_line(external_id: str, name: str, scores: dict) -> str:
+    return json.dumps({"externalId": external_id, "name": name, "scores": scores}, separators=(",", ":")) + "\n"
+
+
+class RosterJournal:
+    """
+    Every upserted student, one NDJSON line each in the format
+    POST /students:bulk takes. Replaying it in order over the CSV roster
+    gives back the roster as it was before a restart.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def append(self, rows: list[tuple[int, str, str, dict]]) -> None:
+        """Writes and fsyncs one parsed chunk."""
+        if not rows:
+            return
+        with open(self.path, "a") as f:
+            f.writelines(_journal_line(external_id, name, scores) for _, external_id, name, scores in rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def replay(self, students: dict[str, Student]) -> BulkUpsert:
+        """
+        Applies the journal to `students` and returns the upsert for its
+        counts. A line torn by a crash fails to parse and is skipped.
+        """
+        upsert = BulkUpsert(students, "ndjson")
+        try:
+            f = open(self.path)
+        except FileNotFoundError:
+            return upsert
+        with f:
+            chunk = []
+            for line in f:
+                chunk.append(line.rstrip("\n"))
+                if len(chunk) == CHUNK_ROWS:
+                    upsert.apply(upsert.parse(chunk))
+                    chunk = []
+            upsert.apply(upsert.parse(chunk))
+        return upsert
+
+    def compact(self, students: dict[str, Student]) -> None:
+        """Rewrites the journal as one line per uploaded student on the roster."""
+        with atomic_open(self.path, "w") as f:
+            for student in students.values():
+                if student.external_id is not None:
+                    f.write(_journal_line(student.external_id, student.name, student.subject_rankings))
+            f.flush()
+            os.fsync(f.fileno())
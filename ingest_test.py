@@ -0,0 +1,118 @@
+import asyncio
+import threading
+
+import pytest
+
+from ingest import BulkUpsert, RosterJournal, iter_line_chunks
+from student import external_student_id, load_student_csv
+
+
+def load_roster():
+    return {str(s.id): s for s in load_student_csv("data/students.csv")}
+
+
+def chunks(pieces: list[bytes], size: int) -> list[list[str]]:
+    async def stream():
+        for piece in pieces:
+            yield piece
+
+    async def collect():
+        return [lines async for lines in iter_line_chunks(stream(), size)]
+
+    return asyncio.run(collect())
+
+
+def test_line_chunks_split_on_lines_not_reads():
+    # A BOM, CRLF endings, a two-byte character split across reads and no final newline
+    text = "\ufeffa,1\r\nb\u00e9,2\nc,3".encode()
+    pieces = [text[:6], text[6:9], text[9:]]
+    assert chunks(pieces, 2) == [["a,1", "b\u00e9,2"], ["c,3"]]
+    assert chunks([b""], 2) == []
+
+
+def test_csv_rows_are_validated_by_line():
+    upsert = BulkUpsert({}, "csv")
+    rows = upsert.parse([
+        "Name,ExternalId,Math Ability Level,Reading Ability Level",
+        "Ada,s-1,7,",
+        ",s-2,3,4",
+        "Bob,,5,5",
+        "",
+        "Cy,s-3,x,1",
+        "Di,s-4,1,99999",
+    ])
+    assert rows == [
+        (2, "s-1", "Ada", {"math": 7, "english": 0}),
+        (3, "s-2", "Unknown", {"math": 3, "english": 4}),
+    ]
+    assert [(e["line"], e["externalId"]) for e in upsert.errors] == [(4, None), (6, "s-3"), (7, "s-4")]
+    assert upsert.report()["failed"] == 3
+
+
+def test_csv_needs_an_id_column():
+    with pytest.raises(ValueError):
+        BulkUpsert({}, "csv").parse(["Name,Math Ability Level", "Ada,7"])
+
+
+def test_ndjson_rows_are_validated_by_line():
+    upsert = BulkUpsert({}, "ndjson")
+    rows = upsert.parse([
+        '{"externalId": 12, "name": "Ada", "scores": {"Reading Ability Level": 4}}',
+        '{"name": "Bob"}',
+        "not json",
+        "[1, 2]",
+        '{"externalId": "s-3", "scores": {"math": 2.5}}',
+        '{"externalId": "s-4", "scores": [1]}',
+    ])
+    assert rows == [(1, "12", "Ada", {"english": 4})]
+    assert [e["line"] for e in upsert.errors] == [2, 3, 4, 5, 6]
+
+
+def test_upsert_adds_new_students_and_updates_known_ones():
+    students = load_roster()
+    count = len(students)
+    upsert = BulkUpsert(students, "ndjson")
+    upsert.ingest(['{"externalId": "s-1", "name": "Ada", "scores": {"math": 7}}'], threading.Lock())
+    ada = students[str(external_student_id("s-1"))]
+    assert (ada.name, ada.get_level("math"), ada.external_id) == ("Ada", 2, "s-1")
+
+    # Same external id: the same student object is updated, keeping its seats
+    seats = ada.schedule
+    upsert.ingest(['{"externalId": "s-1", "name": "Ada L", "scores": {"math": 1}}'], threading.Lock())
+    assert students[str(ada.id)] is ada and ada.schedule is seats
+    assert (ada.name, ada.get_level("math")) == ("Ada L", 0)
+    assert len(students) == count + 1
+    assert (upsert.created, upsert.updated) == (1, 1)
+
+
+def test_journal_replay_restores_uploaded_students(tmp_path):
+    path = str(tmp_path / "roster.ndjson")
+    students = load_roster()
+    upsert = BulkUpsert(students, "csv")
+    upsert.ingest(["ExternalId,Name,Math Ability Level", "s-1,Ada,7", "s-2,Bob,2"], threading.Lock(), RosterJournal(path))
+    update = BulkUpsert(students, "ndjson")
+    update.ingest(['{"externalId": "s-1", "name": "Ada L", "scores": {"math": 1}}'], threading.Lock(), RosterJournal(path))
+
+    # Restart: the CSV roster plus the journal
+    restored = load_roster()
+    journal = RosterJournal(path)
+    replayed = journal.replay(restored)
+    assert (replayed.created, replayed.updated, replayed.failed) == (2, 1, 0)
+    assert set(restored) == set(students)
+    for key, student in students.items():
+        assert (restored[key].name, restored[key].subject_rankings) == (student.name, student.subject_rankings)
+
+    # Compaction keeps one line per uploaded student and replays the same
+    journal.compact(restored)
+    assert len(open(path).readlines()) == 2
+    again = load_roster()
+    journal.replay(again)
+    assert {k: s.subject_rankings for k, s in again.items()} == {k: s.subject_rankings for k, s in students.items()}
+
+
+def test_journal_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / "roster.ndjson"
+    path.write_text('{"externalId":"s-1","name":"Ada","scores":{"math":7}}\n{"externalId":"s-2","na')
+    students = load_roster()
+    replayed = RosterJournal(str(path)).replay(students)
+    assert (replayed.created, replayed.failed) == (1, 1)
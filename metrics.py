@@ -0,0 +1,211 @@
+"""
+Lightweight in-process metrics rendered in the Prometheus text format.
+
+Updating a metric is a dict lookup and an addition under a lock; all of
+the formatting work happens in render(), which only runs when /metrics
+is scraped.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Per-thread switch, so what-if runs can share the pipeline without touching live metrics
+_local = threading.local()
+
+
+@contextmanager
+def recording(enabled: bool = True):
+    """Turns metric updates on or off for the current thread inside the block."""
+    previous = getattr(_local, "enabled", True)
+    _local.enabled = enabled
+    try:
+        yield
+    finally:
+        _local.enabled = previous
+
+
+def _recording() -> bool:
+    return getattr(_local, "enabled", True)
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str, labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[n]) for n in self.labels)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: tuple = ()):
+        super().__init__(name, description, labels)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not _recording():
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = list(self._values.items())
+        if not items and not self.labels:
+            items = [((), 0)]
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    """A value that can be set to anything, e.g. the result of the last run."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        if not _recording():
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Counts observations into fixed cumulative buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}  # key -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels) -> None:
+        if not _recording():
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = _format_labels(self.labels, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {counts[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labels: tuple = ()) -> Counter:
+        return self.register(Counter(name, description, labels))
+
+    def gauge(self, name: str, description: str, labels: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, description, labels))
+
+    def histogram(self, name: str, description: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# -------------------------------------------------
+# Scheduler metrics
+# -------------------------------------------------
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "scheduler_stage_seconds", "Wall time of each scheduler pipeline stage.", ("stage",)
+)
+RUNS = REGISTRY.counter("scheduler_runs_total", "Completed scheduler runs.")
+SECTIONS_CREATED = REGISTRY.counter("scheduler_sections_created_total", "Sections created across all runs.")
+TEACHER_ASSIGNMENT_FAILURES = REGISTRY.counter(
+    "scheduler_teacher_assignment_failures_total", "Sections left without a teacher."
+)
+REPAIRED_CONFLICTS = REGISTRY.counter(
+    "scheduler_repaired_conflicts_total", "Student conflicts resolved by moving students between sibling sections."
+)
+OVERFLOW_STUDENTS = REGISTRY.gauge(
+    "scheduler_overflow_students", "Student enrollments the available teachers could not cover in the last run."
+)
+INFEASIBLE = REGISTRY.gauge(
+    "scheduler_infeasible", "1 if the last run's conflict graph can't fit in the time blocks, else 0."
+)
+SOFT_PENALTY = REGISTRY.gauge(
+    "scheduler_soft_penalty", "Unweighted soft-constraint penalty of the last run.", ("constraint",)
+)
+BLOCK_SECTIONS = REGISTRY.gauge(
+    "scheduler_block_sections", "Sections placed in each time block (by index) in the last run.", ("block",)
+)
+CONFLICT_EDGES = REGISTRY.gauge("scheduler_conflict_edges", "Conflict graph edges in the last run.")
+CONFLICTS_REMAINING = REGISTRY.gauge(
+    "scheduler_conflicts_remaining", "Conflicts and broken back-to-back or room limits left after the last run."
+)
+
+# -------------------------------------------------
+# HTTP metrics
+# -------------------------------------------------
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "API request latency.", ("method", "path", "status")
+)
+PROGRESS_EVENTS_DROPPED = REGISTRY.counter(
+    "http_progress_events_dropped_total", "Progress events dropped because a /schedule/stream client fell behind."
+)
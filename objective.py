@@ -0,0 +1,269 @@
+"""
+Weighted soft constraints for judging the quality of a finished schedule.
+
+An Objective scores a list of sections against a set of constraints.
+Local search only ever moves one section to a different time block, so
+every constraint keeps the counts it needs to price such a move without
+rescanning the schedule: delta() answers "how much would the score
+change", move() applies the change.
+
+    objective = Objective(sections, TIME_BLOCKS)
+    if objective.delta(section, BLOCK_TWO) < 0:
+        objective.move(section, BLOCK_TWO)
+
+New constraints subclass Constraint and are passed in the
+`constraints` list. Block arguments are indices into the objective's
+time blocks, or None for an unscheduled section.
+"""
+from collections import Counter, defaultdict
+
+from consecutive import ConsecutiveLimit
+from constants import TIME_BLOCKS
+from section import Section
+from teacher import Teacher
+from time_block import TimeBlock, time_model
+
+
+class Constraint:
+    name = "constraint"
+
+    def __init__(self, weight: float = 1.0):
+        self.weight = weight
+
+    def attach(self, objective: "Objective") -> None:
+        """Builds the constraint's counts from the objective's current blocks."""
+        self.objective = objective
+
+    def penalty(self) -> float:
+        raise NotImplementedError
+
+    def delta(self, section: Section, old: int | None, new: int | None) -> float:
+        """Change in penalty if `section` moved from block `old` to `new`."""
+        raise NotImplementedError
+
+    def move(self, section: Section, old: int | None, new: int | None) -> None:
+        raise NotImplementedError
+
+
+class TeacherPreference(Constraint):
+    """One point for every section taught by a teacher who ranked the subject 0 rather than 1."""
+    name = "teacher_preference"
+
+    def attach(self, objective):
+        super().attach(objective)
+        self._penalty = 0
+        for section in objective.sections:
+            teacher = section.get_teacher()
+            if teacher is not None and teacher.subjects.get(section.get_subject().lower()) == 0:
+                self._penalty += 1
+
+    def penalty(self):
+        return self._penalty
+
+    # Time moves never change who teaches a section
+    def delta(self, section, old, new):
+        return 0
+
+    def move(self, section, old, new):
+        pass
+
+
+class BackToBack(Constraint):
+    """
+    One point for every section a teacher teaches beyond `limit` in a row,
+    e.g. four back-to-back blocks with a limit of two cost two points
+    (each run of limit + 1 counts once). Without a limit each teacher's
+    own max_consecutive is used. Back to back is as in consecutive.py.
+    """
+    name = "back_to_back"
+
+    def __init__(self, weight: float = 1.0, limit: int | None = None):
+        super().__init__(weight)
+        self.limit = limit
+
+    def attach(self, objective):
+        super().attach(objective)
+        self._limits = ConsecutiveLimit(objective.time_blocks)
+        # teacher -> sections in each block
+        self._rows = defaultdict(lambda: [0] * len(objective.time_blocks))
+        for section in objective.sections:
+            block = objective.block_of(section)
+            if section.get_teacher() is not None and block is not None:
+                self._rows[section.get_teacher()][block] += 1
+        self._penalty = sum(self._row_penalty(teacher, row) for teacher, row in self._rows.items())
+
+    def _row_penalty(self, teacher: Teacher, row: list[int]) -> int:
+        limit = self.limit if self.limit is not None else teacher.max_consecutive
+        mask = sum(1 << i for i, count in enumerate(row) if count)
+        windows = self._limits.windows(limit)
+        return len({w for i in range(len(row)) if row[i] for w in windows.get(1 << i, ()) if mask & w == w})
+
+    def penalty(self):
+        return self._penalty
+
+    def delta(self, section, old, new):
+        teacher = section.get_teacher()
+        if teacher is None or old == new:
+            return 0
+        row = self._rows[teacher]
+        moved = list(row)
+        if old is not None:
+            moved[old] -= 1
+        if new is not None:
+            moved[new] += 1
+        return self._row_penalty(teacher, moved) - self._row_penalty(teacher, row)
+
+    def move(self, section, old, new):
+        change = self.delta(section, old, new)
+        teacher = section.get_teacher()
+        if teacher is None or old == new:
+            return
+        if old is not None:
+            self._rows[teacher][old] -= 1
+        if new is not None:
+            self._rows[teacher][new] += 1
+        self._penalty += change
+
+
+class LevelSpread(Constraint):
+    """
+    The same subject should be offered at different levels in the same
+    block, so students can change level without reshuffling their day.
+    Every section sharing its block only with sections of its own level
+    (of that subject) costs one point.
+    """
+    name = "level_spread"
+
+    def attach(self, objective):
+        super().attach(objective)
+        # (subject, block) -> level -> sections
+        self._cells = defaultdict(Counter)
+        for section in objective.sections:
+            block = objective.block_of(section)
+            if block is not None:
+                self._cells[(section.get_subject(), block)][section.get_level()] += 1
+        self._penalty = sum(self._cell_penalty(c) for c in self._cells.values())
+
+    @staticmethod
+    def _cell_penalty(levels: Counter) -> int:
+        present = [n for n in levels.values() if n]
+        return present[0] if len(present) == 1 else 0
+
+    def penalty(self):
+        return self._penalty
+
+    def _changed_cells(self, section, old, new) -> list[tuple[Counter, Counter]]:
+        """(before, after) level counts of the cells the move touches."""
+        changed = []
+        for block, step in ((old, -1), (new, 1)):
+            if block is None:
+                continue
+            before = self._cells[(section.get_subject(), block)]
+            after = Counter(before)
+            after[section.get_level()] += step
+            changed.append((before, after))
+        return changed
+
+    def delta(self, section, old, new):
+        if old == new:
+            return 0
+        return sum(
+            self._cell_penalty(after) - self._cell_penalty(before)
+            for before, after in self._changed_cells(section, old, new)
+        )
+
+    def move(self, section, old, new):
+        if old == new:
+            return
+        self._penalty += self.delta(section, old, new)
+        for block, step in ((old, -1), (new, 1)):
+            if block is not None:
+                self._cells[(section.get_subject(), block)][section.get_level()] += step
+
+
+class Overlaps(Constraint):
+    """
+    The hard rule as a (heavily weighted) penalty: one point for every
+    edge of the conflict graph whose two sections' blocks overlap. Pricing
+    a move only looks at the section's neighbors.
+    """
+    name = "overlaps"
+
+    def __init__(self, conflicts: dict[Section, set[Section]], weight: float = 100.0):
+        super().__init__(weight)
+        self.conflicts = conflicts
+
+    def _overlap(self, a: int | None, b: int | None) -> bool:
+        return a is not None and b is not None and self.objective.model.masks[a] >> b & 1 == 1
+
+    def attach(self, objective):
+        super().attach(objective)
+        self._penalty = sum(
+            1
+            for section, neighbors in self.conflicts.items()
+            for neighbor in neighbors
+            if self._overlap(objective.block_of(section), objective.block_of(neighbor))
+        ) // 2
+
+    def penalty(self):
+        return self._penalty
+
+    def delta(self, section, old, new):
+        if old == new:
+            return 0
+        change = 0
+        for neighbor in self.conflicts.get(section, ()):
+            block = self.objective.block_of(neighbor)
+            change += self._overlap(block, new) - self._overlap(block, old)
+        return change
+
+    def move(self, section, old, new):
+        self._penalty += self.delta(section, old, new)
+
+
+def default_constraints(conflicts: dict[Section, set[Section]] | None = None) -> list[Constraint]:
+    """The soft preferences, plus the overlap rule when a conflict graph is given."""
+    constraints = [TeacherPreference(), BackToBack(), LevelSpread()]
+    if conflicts is not None:
+        constraints.insert(0, Overlaps(conflicts))
+    return constraints
+
+
+class Objective:
+    def __init__(
+        self,
+        sections: list[Section],
+        time_blocks: list[TimeBlock] = TIME_BLOCKS,
+        constraints: list[Constraint] | None = None
+    ):
+        self.sections = sections
+        self.time_blocks = list(time_blocks)
+        self.model = time_model(self.time_blocks)
+        self._blocks = {section: self.model.id_of(section.get_time()) for section in sections}
+        self.constraints = constraints if constraints is not None else default_constraints()
+        for constraint in self.constraints:
+            constraint.attach(self)
+
+    def block_of(self, section: Section) -> int | None:
+        return self._blocks.get(section)
+
+    def score(self) -> float:
+        """Weighted total penalty; lower is better."""
+        return sum(c.weight * c.penalty() for c in self.constraints)
+
+    def breakdown(self) -> dict[str, float]:
+        """Unweighted penalty of each constraint."""
+        return {c.name: c.penalty() for c in self.constraints}
+
+    def delta(self, section: Section, block: TimeBlock | None) -> float:
+        """Change in score if `section` moved to `block`."""
+        old, new = self.block_of(section), self.model.id_of(block)
+        return sum(c.weight * c.delta(section, old, new) for c in self.constraints)
+
+    def move(self, section: Section, block: TimeBlock | None) -> None:
+        """Moves `section` to `block`, keeping every constraint's counts current."""
+        old, new = self.block_of(section), self.model.id_of(block)
+        for constraint in self.constraints:
+            constraint.move(section, old, new)
+        self._blocks[section] = new
+        section.set_time(block)
@@ -0,0 +1,30 @@
+import random
+
+import pytest
+
+from constants import TIME_BLOCKS
+from generate import generate_roster
+from objective import Objective, default_constraints
+from scheduler import build_conflict_graph, run_pipeline
+from student import load_student_csv
+from teacher import load_teachers_csv
+
+
+def test_delta_and_move_match_a_full_evaluation(tmp_path):
+    students_path, teachers_path = generate_roster(str(tmp_path), 300, seed=1)
+    students, teachers = load_student_csv(students_path), load_teachers_csv(teachers_path)
+    sections, _ = run_pipeline(students, teachers)
+    conflicts = build_conflict_graph(sections, students, teachers)
+    objective = Objective(sections, TIME_BLOCKS, default_constraints(conflicts))
+
+    rng = random.Random(0)
+    for _ in range(500):
+        section = rng.choice(sections)
+        block = rng.choice(TIME_BLOCKS + [None])
+        before = objective.score()
+        change = objective.delta(section, block)
+        objective.move(section, block)
+        assert objective.score() == pytest.approx(before + change)
+
+        full = Objective(sections, TIME_BLOCKS, default_constraints(conflicts))
+        assert objective.breakdown() == full.breakdown()
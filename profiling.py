@@ -0,0 +1,126 @@
+"""
+Opt-in profiling of scheduler runs and API requests.
+
+Set SCHEDULER_PROFILE=1 to profile every scheduler run, or pass
+?profile=1 to an admin endpoint to profile that one request. Each
+profile writes a cProfile `.prof` dump and a `.txt` report (top
+functions plus top tracemalloc allocations) into PROFILE_DIR. Only the
+newest MAX_PROFILES reports are kept.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_DIR = os.environ.get("SCHEDULER_PROFILE_DIR", "out/profiles")
+MAX_PROFILES = int(os.environ.get("SCHEDULER_PROFILE_KEEP", "20"))
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+_lock = threading.Lock()
+_active = False
+
+
+def profiling_enabled() -> bool:
+    """Whether SCHEDULER_PROFILE asks for every scheduler run to be profiled."""
+    return os.environ.get("SCHEDULER_PROFILE", "").lower() in ("1", "true", "yes")
+
+
+def _write_report(stem: str, profiler: cProfile.Profile, snapshot: tracemalloc.Snapshot, elapsed: float) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(os.path.join(PROFILE_DIR, stem + ".prof"))
+
+    out = io.StringIO()
+    out.write(f"Wall time: {elapsed:.3f}s\n\n")
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+    out.write("Top allocations:\n")
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        out.write(f"  {stat}\n")
+
+    with open(os.path.join(PROFILE_DIR, stem + ".txt"), "w") as f:
+        f.write(out.getvalue())
+
+
+def _prune() -> None:
+    """Drops the oldest reports so at most MAX_PROFILES remain."""
+    for profile in list_profiles()[MAX_PROFILES:]:
+        for name in profile["files"]:
+            try:
+                os.remove(os.path.join(PROFILE_DIR, name))
+            except FileNotFoundError:
+                pass
+
+
+@contextmanager
+def profile(label: str):
+    """
+    Profiles the enclosed block and stores its report. Nested or
+    concurrent calls run unprofiled, since only one profiler can be
+    active at a time.
+    """
+    global _active
+    with _lock:
+        nested = _active
+        _active = True
+    if nested:
+        yield
+        return
+
+    try:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+
+            label = re.sub(r"[^A-Za-z0-9_-]+", "-", label).strip("-") or "profile"
+            stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 1_000_000:06d}-{label}"
+            _write_report(stem, profiler, snapshot, elapsed)
+            _prune()
+    finally:
+        # Even if writing the report failed; otherwise no later run would be profiled
+        with _lock:
+            _active = False
+
+
+def list_profiles() -> list[dict]:
+    """Returns stored reports, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+
+    grouped = {}
+    for name in os.listdir(PROFILE_DIR):
+        stem, ext = os.path.splitext(name)
+        if ext in (".prof", ".txt"):
+            grouped.setdefault(stem, []).append(name)
+
+    profiles = []
+    for stem, files in grouped.items():
+        created = min(os.path.getmtime(os.path.join(PROFILE_DIR, f)) for f in files)
+        profiles.append({"name": stem, "created": created, "files": sorted(files)})
+
+    return sorted(profiles, key=lambda p: (p["created"], p["name"]), reverse=True)
+
+
+def profile_path(file_name: str) -> str | None:
+    """Returns the path of a stored report file, or None if there is no such file."""
+    if os.path.basename(file_name) != file_name:
+        return None
+    path = os.path.join(PROFILE_DIR, file_name)
+    return path if os.path.isfile(path) else None
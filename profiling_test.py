@@ -0,0 +1,14 @@
+import pytest
+
+import profiling
+
+
+def test_a_failed_report_does_not_block_later_profiles(monkeypatch):
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(profiling, "_write_report", fail)
+    with pytest.raises(OSError):
+        with profiling.profile("first"):
+            pass
+    assert not profiling._active
@@ -0,0 +1,52 @@
+"""
+Fan-out of scheduler progress events to server-sent event streams.
+
+The pipeline calls ProgressFeed.publish from the scheduling thread, so
+publishing must never wait on a client: each subscriber has a bounded
+queue, and when a slow client's queue is full its oldest event is
+dropped to make room. A client that falls behind misses intermediate
+progress but still gets the latest events, including the final one.
+"""
+import json
+import queue
+import threading
+
+import metrics
+
+
+class ProgressFeed:
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._subscribers: list[queue.Queue] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        subscriber = queue.Queue(self.maxsize)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def publish(self, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                        metrics.PROGRESS_EVENTS_DROPPED.inc()
+                    except queue.Empty:
+                        pass
+
+
+def sse(event: dict) -> str:
+    """One event in the text/event-stream format."""
+    return f"event: {event['event']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
@@ -0,0 +1,118 @@
+"""
+What-if runs of the scheduler that leave the live roster alone.
+
+run_pipeline fills in every Student's and Teacher's schedule list, so a
+scenario runs on an overlay instead: a shallow copy of each student and
+teacher with a fresh, empty schedule. The copies share everything the
+pipeline only reads (names, ids, score tables, subject weights) with the
+live objects, so a scenario costs one small object per person rather
+than a deep copy of the roster.
+
+    scenario = Scenario.from_json({"class_limit": 8, "teachers": {"remove": ["Nathan"]}})
+    result = compare(
+        run_scenario(students, teachers, Scenario()),
+        run_scenario(students, teachers, scenario)
+    )
+"""
+import copy
+import time
+from dataclasses import dataclass, field
+
+from constants import MAX_CONSECUTIVE
+from objective import Objective
+from scheduler import PipelineIssues, run_pipeline
+from section import Section
+from student import Student
+from teacher import Teacher
+from tenant import TenantConfig
+from time_block import TimeBlock
+
+# Summary fields compared between the baseline and a scenario
+COMPARED = ("sections", "unassignedSections", "overflow", "infeasible", "conflicts", "softPenalty")
+
+
+@dataclass
+class Scenario:
+    """Overrides on top of the live roster and configuration."""
+    config: TenantConfig = field(default_factory=TenantConfig)
+    add_teachers: list[Teacher] = field(default_factory=list)
+    remove_teachers: set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_json(cls, data: dict, block_capacity: int | None = None) -> "Scenario":
+        """
+        Accepts the tenant config keys (class_limit, time_blocks,
+        block_capacity) plus
+
+            "teachers": {
+                "add": [{"name": "Ada", "subjects": {"math": 1}, "sections": 6, "max_consecutive": 2}],
+                "remove": ["Nathan"]
+            }
+
+        Added teachers replace live teachers of the same name.
+        """
+        config = TenantConfig.from_json({"block_capacity": block_capacity, **data})
+        overrides = data.get("teachers", {})
+        add_teachers = [
+            Teacher(
+                {subject.lower(): int(weight) for subject, weight in t["subjects"].items()},
+                int(t.get("sections", 6)),
+                str(t["name"]),
+                bool(t.get("is_mentor", False)),
+                int(t.get("max_consecutive", MAX_CONSECUTIVE))
+            )
+            for t in overrides.get("add", [])
+        ]
+        return cls(config, add_teachers, {str(name) for name in overrides.get("remove", [])})
+
+    def teachers(self, teachers: list[Teacher]) -> list[Teacher]:
+        """Overlay of `teachers` with this scenario's additions and removals."""
+        replaced = self.remove_teachers | {t.name for t in self.add_teachers}
+        kept = [_overlay(t) for t in teachers if t.name not in replaced]
+        return kept + [_overlay(t) for t in self.add_teachers]
+
+
+def _overlay(person: Student | Teacher) -> Student | Teacher:
+    """Shallow copy with an empty schedule of its own."""
+    clone = copy.copy(person)
+    clone.schedule = []
+    return clone
+
+
+def summarize(sections: list[Section], issues: PipelineIssues, time_blocks: list[TimeBlock], seconds: float) -> dict:
+    objective = Objective(sections, time_blocks)
+    return {
+        "sections": len(sections),
+        "unassignedSections": sum(1 for s in sections if s.get_teacher() is None),
+        **issues.counts(),
+        "softPenalty": objective.score(),
+        "penalties": objective.breakdown(),
+        "seconds": round(seconds, 3)
+    }
+
+
+def run_scenario(students: list[Student], teachers: list[Teacher], scenario: Scenario) -> dict:
+    """Schedules an overlay of the roster under `scenario` and summarizes the result."""
+    start = time.perf_counter()
+    config = scenario.config
+    sections, issues = run_pipeline(
+        [_overlay(s) for s in students],
+        scenario.teachers(teachers),
+        config.class_limit,
+        config.time_blocks,
+        block_capacity=config.block_capacity,
+        # The process-wide metrics describe the live schedule only
+        record_metrics=False
+    )
+    summary = summarize(sections, issues, config.time_blocks, time.perf_counter() - start)
+    summary["issues"] = issues.all()
+    return summary
+
+
+def compare(baseline: dict, result: dict) -> dict:
+    """Both summaries, plus how much each compared field changed."""
+    return {
+        "baseline": baseline,
+        "scenario": result,
+        "delta": {key: result[key] - baseline[key] for key in COMPARED}
+    }
@@ -0,0 +1,17 @@
+import metrics
+from scenario import Scenario, run_scenario
+from student import load_student_csv
+from teacher import load_teachers_csv
+
+
+def test_scenario_leaves_live_state_and_metrics_alone():
+    students = load_student_csv("data/students.csv")
+    teachers = load_teachers_csv("teachers.csv")
+    rendered = metrics.REGISTRY.render()
+
+    result = run_scenario(students, teachers, Scenario.from_json({"class_limit": 3}))
+
+    assert result["sections"] > 0
+    assert metrics.REGISTRY.render() == rendered
+    assert all(not s.get_schedule() for s in students)
+    assert all(not t.schedule for t in teachers)
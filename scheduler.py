@@ -0,0 +1,747 @@
+from bucket import Bucket, create_buckets
+from section import Section
+from student import Student
+from teacher import Teacher
+from constants import CLASS_LIMIT, ID_NAMESPACE, LEVEL_DICT, LEVELS, TIME_BLOCKS
+from feasibility import InfeasibleScheduleError, check_feasibility
+from consecutive import ConsecutiveLimit
+from flow import FlowNetwork
+from objective import Objective
+from time_block import TimeBlock, TimeModel, time_model
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Callable
+from dataclasses import dataclass
+import heapq
+import metrics
+import numpy as np
+import time
+import uuid
+
+# Receives progress events (dicts) while the pipeline runs; must not block
+Progress = Callable[[dict], None]
+
+# -------------------------------------------------
+# Pipeline stages
+#
+# Each stage is a plain function so callers (the API, main.py, the
+# benchmark suite) can run or time them individually.
+# -------------------------------------------------
+
+def assign_buckets(students_list: list[Student]) -> list[Bucket]:
+    """
+    Creates a bucket for every level of every subject the students have
+    scores in, and fills them. Levels are read straight from each score
+    table's level matrix, one vectorized pass per subject and level.
+    """
+    members = defaultdict(list)  # score table -> its students in students_list
+    for student in students_list:
+        members[student.table].append(student)
+
+    subjects = list(dict.fromkeys(subject for table in members for subject in table.subjects))
+    buckets, _ = create_buckets(subjects)
+    by_key = {(b.subject, b.level): b for b in buckets}
+
+    for table, students in members.items():
+        columns = np.fromiter((s.column for s in students), dtype=np.intp, count=len(students))
+        levels = table.levels[:, columns]
+        for subject, row in table.rows.items():
+            for level in LEVELS:
+                bucket = by_key[(subject, level)]
+                for i in np.flatnonzero(levels[row] == level):
+                    bucket.add_student(students[i])
+
+    return buckets
+
+
+def _combination_key(student: Student, subject: str) -> tuple:
+    """The student's levels in every subject other than `subject`."""
+    table = student.table
+    levels = table.levels[:, student.column]
+    return tuple(int(levels[row]) for other, row in sorted(table.rows.items()) if other != subject)
+
+
+def partition_students(students: list[Student], subject: str, sections_needed: int) -> list[list[Student]]:
+    """
+    Splits a bucket's students into `sections_needed` groups whose sizes
+    differ by at most one.
+
+    Students are ordered by their levels in the other subjects first, so
+    students who share a bucket combination land in the same sections.
+    They then meet the same few sections in every other subject, which
+    keeps the conflict graph sparse and easier to color.
+    """
+    ordered = sorted(students, key=lambda s: _combination_key(s, subject))
+    size, extra = divmod(len(ordered), sections_needed)
+
+    groups = []
+    start = 0
+    for i in range(sections_needed):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(ordered[start:end])
+        start = end
+    return groups
+
+
+@dataclass
+class SectionPlan:
+    """How many sections each bucket gets, given the teachers available."""
+    sections: dict[tuple[str, int], int]
+    overflow: dict[tuple[str, int], list[Student]]
+    supply: dict[str, int]
+    # str(teacher.id) -> subject -> sections of that subject the teacher should take
+    quotas: dict[str, dict[str, int]]
+
+    def overflow_issues(self) -> list[str]:
+        return [
+            f"Overflow: {student} has no {LEVEL_DICT.get(level, level)} {subject} section"
+            for (subject, level), students in self.overflow.items()
+            for student in students
+        ]
+
+
+def plan_sections(
+    buckets: list[Bucket],
+    teachers_list: list[Teacher],
+    class_limit: int = CLASS_LIMIT,
+    time_blocks: list[TimeBlock] = TIME_BLOCKS
+) -> SectionPlan:
+    """
+    Decides how many sections each bucket gets from the teaching capacity
+    available, before any sections are created.
+
+    Teacher capacity (Teacher.sections, or fewer when their back-to-back
+    limit leaves fewer usable blocks) is routed to subjects with a max
+    flow: source -> teacher -> subject -> sink, where a teacher connects to
+    every subject they weight 0 or 1 and a subject asks for the sections
+    all of its buckets need. Weight 1 edges are filled first, weight 0
+    edges only add to that. Each subject's staffable sections then go to
+    its buckets one at a time, always to the bucket with the most students
+    still unplaced, so larger classes are served first. Students who do
+    not fit are reported as overflow.
+    """
+    demand = defaultdict(int)
+    for bucket in buckets:
+        demand[bucket.subject] += bucket.get_sections_needed(class_limit)
+
+    limits = ConsecutiveLimit(time_blocks)
+    capacity = {
+        str(t.id): min(t.sections, limits.max_blocks(t.max_consecutive))
+        for t in teachers_list
+    }
+
+    network = FlowNetwork()
+    for subject, needed in demand.items():
+        network.add_edge(("subject", subject), "sink", needed)
+    for teacher in teachers_list:
+        network.add_edge("source", ("teacher", str(teacher.id)), capacity[str(teacher.id)])
+
+    for weight in (1, 0):
+        for teacher in teachers_list:
+            for subject in demand:
+                if teacher.subjects.get(subject, -1) == weight:
+                    network.add_edge(("teacher", str(teacher.id)), ("subject", subject), capacity[str(teacher.id)])
+        network.max_flow("source", "sink")
+
+    supply = {subject: network.flow(("subject", subject), "sink") for subject in demand}
+    quotas = {
+        str(t.id): {
+            subject: network.flow(("teacher", str(t.id)), ("subject", subject))
+            for subject in demand
+        }
+        for t in teachers_list
+    }
+
+    sections = {}
+    overflow = {}
+    for subject, available in supply.items():
+        subject_buckets = [b for b in buckets if b.subject == subject]
+        allocated = {id(b): 0 for b in subject_buckets}
+
+        for _ in range(available):
+            bucket = max(subject_buckets, key=lambda b: b.get_size() - allocated[id(b)] * class_limit)
+            if bucket.get_size() - allocated[id(bucket)] * class_limit <= 0:
+                break
+            allocated[id(bucket)] += 1
+
+        for bucket in subject_buckets:
+            key = (bucket.subject, bucket.level)
+            sections[key] = allocated[id(bucket)]
+            seats = allocated[id(bucket)] * class_limit
+            if bucket.get_size() > seats:
+                ordered = sorted(bucket.get_students(), key=lambda s: _combination_key(s, subject))
+                overflow[key] = ordered[seats:]
+
+    return SectionPlan(sections, overflow, supply, quotas)
+
+
+def create_sections(
+    buckets: list[Bucket],
+    class_limit: int = CLASS_LIMIT,
+    plan: SectionPlan | None = None
+) -> list[Section]:
+    """
+    Splits every bucket into sections and enrolls its students. With a
+    plan, buckets get the planned number of sections and overflow
+    students are left out.
+    """
+    sections_list = []
+
+    for bucket in buckets:
+        students = bucket.get_students()
+        needed = bucket.get_sections_needed(class_limit)
+
+        if plan is not None:
+            key = (bucket.subject, bucket.level)
+            needed = plan.sections.get(key, 0)
+            left_out = set(map(id, plan.overflow.get(key, [])))
+            students = [s for s in students if id(s) not in left_out]
+        if needed == 0:
+            continue
+
+        for group in partition_students(students, bucket.subject, needed):
+            section = Section(bucket.subject, bucket.level, capacity=class_limit)
+
+            for student in group:
+                section.add_student(student)
+                student.add_section(section)
+
+            sections_list.append(section)
+
+    return sections_list
+
+
+def assign_teachers(
+    sections_list: list[Section],
+    teachers_list: list[Teacher],
+    quotas: dict[str, dict[str, int]] | None = None
+) -> list[Section]:
+    """
+    Assigns the least loaded teacher to each section, preferring teachers
+    with a weight of 1 over 0. With quotas (from plan_sections), a teacher
+    only takes as many sections of a subject as the plan routed to them.
+    Candidates sit in one heap per (subject, weight) ordered by load, so
+    each pick is O(log teachers). Returns the sections left without a teacher.
+    """
+    order = {id(t): i for i, t in enumerate(teachers_list)}
+    remaining = {k: dict(v) for k, v in quotas.items()} if quotas is not None else None
+    heaps = {}
+    unassigned = []
+
+    def candidates(subject: str, weight: int) -> list:
+        if (subject, weight) not in heaps:
+            heap = [
+                (len(t.schedule), order[id(t)], t)
+                for t in teachers_list
+                if t.subjects.get(subject, -1) == weight
+            ]
+            heapq.heapify(heap)
+            heaps[(subject, weight)] = heap
+        return heaps[(subject, weight)]
+
+    for section in sections_list:
+        subject = section.get_subject().lower()
+
+        for weight in (1, 0):
+            heap = candidates(subject, weight)
+            teacher = None
+            while heap:
+                load, _, candidate = heap[0]
+                if candidate.is_full() or (remaining is not None and remaining[str(candidate.id)].get(subject, 0) <= 0):
+                    # Loads and quotas only move one way, so it can't become eligible again
+                    heapq.heappop(heap)
+                elif load != len(candidate.schedule):
+                    # Picked up sections of another subject since it was pushed
+                    heapq.heapreplace(heap, (len(candidate.schedule), order[id(candidate)], candidate))
+                else:
+                    teacher = candidate
+                    break
+            if teacher is None:
+                continue
+
+            # set_teacher checks is_full, so it must run before add_section fills the last slot
+            section.set_teacher(teacher)
+            teacher.add_section(section)
+            if remaining is not None:
+                remaining[str(teacher.id)][subject] -= 1
+            heapq.heapreplace(heap, (len(teacher.schedule), order[id(teacher)], teacher))
+            break
+        else:
+            unassigned.append(section)
+
+    return unassigned
+
+
+def assign_section_ids(sections_list: list[Section]) -> None:
+    """
+    Gives each section an id derived from its subject, level, teacher and
+    ordinal among the sections sharing those, so rerunning the same roster
+    reproduces the same ids and schedule diffs only show real changes.
+    """
+    ordinals = defaultdict(int)
+    for section in sections_list:
+        teacher = section.get_teacher()
+        key = (section.get_subject(), section.get_level(), teacher.name if teacher is not None else "")
+        section.set_id(uuid.uuid5(ID_NAMESPACE, "section:{}|{}|{}|{}".format(*key, ordinals[key])))
+        ordinals[key] += 1
+
+
+def build_conflict_graph(
+    sections_list: list[Section],
+    students_list: list[Student],
+    teachers_list: list[Teacher]
+) -> dict[Section, set[Section]]:
+    conflicts = {s: set() for s in sections_list}
+
+    # Student conflicts
+    for student in students_list:
+        sched = student.get_schedule()
+        for i in range(len(sched)):
+            for j in range(i + 1, len(sched)):
+                s1, s2 = sched[i], sched[j]
+                conflicts[s1].add(s2)
+                conflicts[s2].add(s1)
+
+    # Teacher conflicts
+    for teacher in teachers_list:
+        sched = teacher.schedule
+        for i in range(len(sched)):
+            for j in range(i + 1, len(sched)):
+                s1, s2 = sched[i], sched[j]
+                conflicts[s1].add(s2)
+                conflicts[s2].add(s1)
+
+    return conflicts
+
+
+def _least_conflicting_block(
+    section: Section,
+    neighbors: set[Section],
+    time_blocks: list[TimeBlock],
+    model: TimeModel
+) -> TimeBlock:
+    """
+    Picks the block that clashes with the fewest students. Teacher clashes
+    are counted first, so a block that double-books the teacher loses to
+    any number of student clashes: moving students between sections can
+    fix those afterwards, but nothing fixes a shared teacher.
+    """
+    students = set(map(id, section.get_students()))
+    teacher = section.get_teacher()
+    # block -> [teacher clashes, student clashes]
+    cost = {block: [0, 0] for block in time_blocks}
+
+    for neighbor in neighbors:
+        block = neighbor.get_time()
+        if block is None:
+            continue
+        shared_teacher = int(teacher is not None and neighbor.get_teacher() is teacher)
+        clash = sum(1 for st in neighbor.get_students() if id(st) in students)
+        for candidate in time_blocks:
+            if model.overlap(candidate, block):
+                cost[candidate][0] += shared_teacher
+                cost[candidate][1] += clash
+
+    return min(time_blocks, key=lambda b: cost[b])
+
+
+def assign_time_blocks(
+    sections_list: list[Section],
+    students_list: list[Student],
+    teachers_list: list[Teacher],
+    conflicts: dict[Section, set[Section]] | None = None,
+    time_blocks: list[TimeBlock] = TIME_BLOCKS,
+    strict: bool = True,
+    equitable: bool = False,
+    block_capacity: int | None = None,
+    progress: Progress | None = None
+) -> None:
+    """
+    Greedy graph coloring, most constrained sections first. A block is
+    free when no neighbor's block overlaps it, it keeps the teacher within their
+    back-to-back limit and it has fewer than `block_capacity` sections
+    (rooms). Equitable mode takes the least loaded free block instead of
+    the first one, so sections spread evenly over the day.
+
+    When a section has no free block, strict mode raises; otherwise the
+    section gets the least conflicting block that still has a room and
+    the teacher's limit allows, and the conflict is left for
+    repair_student_conflicts. Only when no such block exists does it give
+    up the teacher's limit, then the rooms; check_for_conflicts reports
+    those breaks. Strict mode first checks the lower bounds
+    in feasibility.py and raises InfeasibleScheduleError without coloring
+    if they can't be met. `progress` hears how many sections were placed
+    in a conflicting block so far, about twenty times per run.
+    """
+    if conflicts is None:
+        conflicts = build_conflict_graph(sections_list, students_list, teachers_list)
+    limits = ConsecutiveLimit(time_blocks)
+    model = time_model(time_blocks)
+    # block id -> sections placed there; a block's rooms are shared with every block it overlaps
+    load = [0] * len(model.blocks)
+
+    def in_use(block: TimeBlock) -> int:
+        return sum(load[j] for j in model.overlapping[model.ids[block]])
+
+    if strict:
+        report = check_feasibility(
+            sections_list, students_list, teachers_list, conflicts, len(time_blocks), limits, block_capacity
+        )
+        if not report.feasible:
+            raise InfeasibleScheduleError(report)
+
+    ordered = sorted(
+        sections_list,
+        key=lambda s: len(conflicts[s]),
+        reverse=True
+    )
+
+    step = max(1, len(ordered) // 20)
+    conflicting = 0
+
+    for i, section in enumerate(ordered):
+        if progress is not None and i % step == 0:
+            progress({"event": "progress", "stage": "coloring", "done": i, "total": len(ordered), "conflicts": conflicting})
+        used = 0
+        for neighbor in conflicts[section]:
+            used |= model.mask(neighbor.get_time())
+
+        teacher = section.get_teacher()
+        candidates = list(time_blocks)
+        if equitable:
+            # Stable, so equally loaded blocks keep their order
+            candidates.sort(key=in_use)
+        with_room = [b for b in candidates if block_capacity is None or in_use(b) < block_capacity]
+        allowed = [b for b in with_room if limits.allows(teacher, b)]
+
+        for block in allowed:
+            if not used >> model.ids[block] & 1:
+                section.set_time(block)
+                break
+        else:
+            if strict:
+                raise RuntimeError(f"Could not assign time block to {section}")
+            fallback = allowed or with_room or candidates
+            section.set_time(_least_conflicting_block(section, conflicts[section], fallback, model))
+            conflicting += 1
+        limits.add(teacher, section.get_time())
+        load[model.ids[section.get_time()]] += 1
+
+
+def _busy_mask(student: Student, leaving: Section, model: TimeModel) -> int:
+    """Blocks `student` can't attend once they leave `leaving`, as a bitmask."""
+    busy = 0
+    for sec in student.get_schedule():
+        if sec is not leaving:
+            busy |= model.mask(sec.get_time())
+    return busy
+
+
+def _augment(
+    student: Student,
+    source: Section,
+    siblings: dict[int, list[Section]],
+    class_limit: int,
+    model: TimeModel
+) -> bool:
+    """
+    Moves `student` out of `source` into a sibling section whose block is
+    free for them. If that sibling is full, one of its students moves on
+    to another sibling, and so on (a BFS for an augmenting path). Every
+    student moved along the path ends up in a block that is free for them.
+
+    Siblings are grouped by block id. The first mover who can attend a
+    block queues every section in it, so each block is expanded once and
+    a search stays linear in the bucket's size.
+    """
+    # parent[section] = (student moving into section, section they leave)
+    parent = {}
+    queue = deque()
+    expanded = set()
+
+    def reach(mover: Student, leaving: Section):
+        busy = _busy_mask(mover, leaving, model)
+        for block, sections in siblings.items():
+            if block in expanded or busy >> block & 1:
+                continue
+            complete = True
+            for target in sections:
+                if target in parent:
+                    continue
+                if target is leaving:
+                    complete = False
+                    continue
+                parent[target] = (mover, leaving)
+                queue.append(target)
+            if complete:
+                expanded.add(block)
+
+    reach(student, source)
+
+    while queue:
+        section = queue.popleft()
+
+        # `source` gains a seat once `student` leaves it
+        if section is source or len(section.get_students()) < class_limit:
+            moves = []
+            while True:
+                mover, previous = parent[section]
+                moves.append((mover, previous, section))
+                if mover is student:
+                    break
+                section = previous
+            # Leave every section before joining any, so none goes over capacity
+            for mover, previous, _ in moves:
+                previous.remove_student(mover)
+                mover.remove_section(previous)
+            for mover, _, target in moves:
+                target.add_student(mover)
+                mover.add_section(target)
+            return True
+
+        for other in section.get_students():
+            if other is not student:
+                reach(other, section)
+
+    return False
+
+
+def repair_student_conflicts(
+    sections_list: list[Section],
+    students_list: list[Student],
+    class_limit: int = CLASS_LIMIT,
+    time_blocks: list[TimeBlock] = TIME_BLOCKS,
+    progress: Progress | None = None
+) -> int:
+    """
+    After time blocks are fixed, moves students with two sections in
+    overlapping blocks into a sibling section (same subject and level) in
+    a free block. Section times and teachers are never changed. Returns
+    the number of conflicts resolved; `progress` hears the resolved and
+    unresolved counts so far, about twenty times per run.
+    """
+    model = time_model(time_blocks)
+    # (subject, level) -> block id -> sections
+    siblings = defaultdict(lambda: defaultdict(list))
+    for section in sections_list:
+        block = model.id_of(section.get_time())
+        if block is not None:
+            siblings[(section.get_subject(), section.get_level())][block].append(section)
+
+    resolved = 0
+    unresolved = 0
+    step = max(1, len(students_list) // 20)
+    for i, student in enumerate(students_list):
+        if progress is not None and i % step == 0:
+            progress({
+                "event": "progress", "stage": "repair", "done": i, "total": len(students_list),
+                "resolved": resolved, "conflicts": unresolved
+            })
+        # Keep the first of any overlapping sections, try to move the student out of the rest
+        kept = []
+        for section in list(student.get_schedule()):
+            if section.get_time() is None:
+                continue
+            if any(model.overlap(section.get_time(), k.get_time()) for k in kept):
+                bucket = siblings[(section.get_subject(), section.get_level())]
+                if _augment(student, section, bucket, class_limit, model):
+                    resolved += 1
+                    continue
+                unresolved += 1
+            kept.append(section)
+
+    return resolved
+
+
+def count_clashes(schedule: list[Section], model: TimeModel) -> int:
+    """How many sections of one schedule overlap an earlier one in it."""
+    seen = 0
+    clashes = 0
+    for sec in schedule:
+        i = model.id_of(sec.get_time())
+        if i is None:
+            continue
+        if seen >> i & 1:
+            clashes += 1
+        seen |= model.masks[i]
+    return clashes
+
+
+def check_for_conflicts(
+    students_list: list[Student],
+    teachers_list: list[Teacher],
+    time_blocks: list[TimeBlock] = TIME_BLOCKS,
+    sections_list: list[Section] | None = None,
+    block_capacity: int | None = None
+) -> list[str]:
+    """
+    One issue for every section that overlaps an earlier one in the same
+    schedule, every run of back-to-back blocks longer than a teacher's
+    limit and, given the sections and a room limit, every block with more
+    sections than rooms. Non-strict coloring can break the last two when a
+    section has nowhere else to go.
+    """
+    model = time_model(time_blocks)
+    issues = []
+
+    for student in students_list:
+        issues += [f"Student conflict: {student}"] * count_clashes(student.get_schedule(), model)
+
+    for teacher in teachers_list:
+        issues += [f"Teacher conflict: {teacher}"] * count_clashes(teacher.schedule, model)
+
+    limits = ConsecutiveLimit(time_blocks)
+    for teacher in teachers_list:
+        mask = 0
+        for sec in teacher.schedule:
+            mask |= limits.bits.get(sec.get_time(), 0)
+        windows = {w for masks in limits.windows(teacher.max_consecutive).values() for w in masks}
+        issues += [
+            f"Back-to-back: {teacher} is over their limit of {teacher.max_consecutive} in a row"
+        ] * sum(1 for w in windows if mask & w == w)
+
+    if sections_list is not None and block_capacity is not None:
+        load = [0] * len(model.blocks)
+        for section in sections_list:
+            i = model.id_of(section.get_time())
+            if i is not None:
+                load[i] += 1
+        for i, block in enumerate(model.blocks):
+            # A block's rooms are shared with every block it overlaps, as in assign_time_blocks
+            in_use = sum(load[j] for j in model.overlapping[i])
+            if in_use > block_capacity:
+                issues.append(f"Room shortage: {in_use} sections at {block} for {block_capacity} rooms")
+
+    return issues
+
+
+# -------------------------------------------------
+# Full pipeline
+# -------------------------------------------------
+
+@dataclass
+class PipelineIssues:
+    """Everything a run couldn't satisfy, by kind, as readable messages."""
+    # students the teachers can't cover (SectionPlan.overflow_issues)
+    overflow: list[str]
+    # lower bounds the time blocks can't meet (InfeasibilityReport.issues)
+    infeasible: list[str]
+    # overlaps and broken back-to-back or room limits (check_for_conflicts)
+    conflicts: list[str]
+
+    def all(self) -> list[str]:
+        """Every message, overflow first, then infeasibility, then conflicts."""
+        return self.overflow + self.infeasible + self.conflicts
+
+    def counts(self) -> dict[str, int]:
+        return {"overflow": len(self.overflow), "infeasible": len(self.infeasible), "conflicts": len(self.conflicts)}
+
+
+def reset_schedules(students_list: list[Student], teachers_list: list[Teacher]) -> None:
+    """Clears every student and teacher schedule (important if re-running)."""
+    for s in students_list:
+        s.schedule.clear()
+    for t in teachers_list:
+        t.schedule.clear()
+
+
+@contextmanager
+def _stage(name: str, timings: dict | None, progress: Progress | None = None):
+    """Records a stage's wall time in the metrics registry (and `timings`, and reports it to `progress`)."""
+    if progress is not None:
+        progress({"event": "stage", "stage": name, "status": "started"})
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.STAGE_SECONDS.observe(elapsed, stage=name)
+        if timings is not None:
+            timings[name] = elapsed
+        if progress is not None:
+            progress({"event": "stage", "stage": name, "status": "finished", "seconds": round(elapsed, 4)})
+
+
+def run_pipeline(
+    students_list: list[Student],
+    teachers_list: list[Teacher],
+    class_limit: int = CLASS_LIMIT,
+    time_blocks: list[TimeBlock] = TIME_BLOCKS,
+    timings: dict | None = None,
+    strict: bool = False,
+    block_capacity: int | None = None,
+    progress: Progress | None = None,
+    record_metrics: bool = True
+) -> tuple[list[Section], PipelineIssues]:
+    """
+    Runs every stage and returns the created sections and any issues
+    (see PipelineIssues). An infeasible instance still gets a
+    best-effort schedule unless `strict`, in which case InfeasibleScheduleError
+    is raised before coloring. Time blocks are colored equitably, with at
+    most `block_capacity` sections (rooms) per block when it is given.
+    Stage wall times are also written into `timings` when it is given,
+    and stage, coloring and repair progress is reported to `progress`.
+    With `record_metrics` off (what-if and tenant runs) the process-wide
+    metrics are left alone.
+    """
+    with metrics.recording(record_metrics):
+        reset_schedules(students_list, teachers_list)
+
+        with _stage("bucketing", timings, progress):
+            buckets = assign_buckets(students_list)
+        with _stage("planning", timings, progress):
+            plan = plan_sections(buckets, teachers_list, class_limit, time_blocks)
+        overflow = plan.overflow_issues()
+        metrics.OVERFLOW_STUDENTS.set(len(overflow))
+
+        with _stage("section_creation", timings, progress):
+            sections_list = create_sections(buckets, class_limit, plan)
+        metrics.SECTIONS_CREATED.inc(len(sections_list))
+
+        with _stage("teacher_assignment", timings, progress):
+            unassigned = assign_teachers(sections_list, teachers_list, plan.quotas)
+        metrics.TEACHER_ASSIGNMENT_FAILURES.inc(len(unassigned))
+        assign_section_ids(sections_list)
+
+        with _stage("conflict_graph", timings, progress):
+            conflicts = build_conflict_graph(sections_list, students_list, teachers_list)
+        metrics.CONFLICT_EDGES.set(sum(len(n) for n in conflicts.values()) // 2)
+
+        with _stage("feasibility", timings, progress):
+            report = check_feasibility(
+                sections_list, students_list, teachers_list, conflicts, len(time_blocks),
+                ConsecutiveLimit(time_blocks), block_capacity
+            )
+        metrics.INFEASIBLE.set(0 if report.feasible else 1)
+        if strict and not report.feasible:
+            raise InfeasibleScheduleError(report)
+
+        with _stage("coloring", timings, progress):
+            assign_time_blocks(
+                sections_list, students_list, teachers_list, conflicts, time_blocks,
+                strict=False, equitable=True, block_capacity=block_capacity, progress=progress
+            )
+        for i, block in enumerate(time_blocks):
+            metrics.BLOCK_SECTIONS.set(sum(1 for s in sections_list if s.get_time() == block), block=i)
+        with _stage("repair", timings, progress):
+            metrics.REPAIRED_CONFLICTS.inc(repair_student_conflicts(sections_list, students_list, class_limit, time_blocks, progress))
+        with _stage("conflict_check", timings, progress):
+            issues = check_for_conflicts(students_list, teachers_list, time_blocks, sections_list, block_capacity)
+        metrics.CONFLICTS_REMAINING.set(len(issues))
+
+        with _stage("scoring", timings, progress):
+            objective = Objective(sections_list, time_blocks)
+        for name, penalty in objective.breakdown().items():
+            metrics.SOFT_PENALTY.set(penalty, constraint=name)
+
+        result = PipelineIssues(overflow, report.issues(), issues)
+        metrics.RUNS.inc()
+        if progress is not None:
+            progress({
+                "event": "summary",
+                "sections": len(sections_list),
+                "unassignedSections": len(unassigned),
+                **result.counts(),
+                "softPenalty": objective.score()
+            })
+        return sections_list, result
@@ -0,0 +1,87 @@
+from constants import TIME_BLOCKS
+from scheduler import _augment, _least_conflicting_block, check_for_conflicts
+from section import Section
+from student import Student
+from teacher import Teacher
+from time_block import time_model
+
+MODEL = time_model(TIME_BLOCKS)
+
+
+def enroll(section: Section, *students: Student) -> None:
+    for student in students:
+        section.add_student(student)
+        student.add_section(section)
+
+
+def placed(subject: str, block: int, capacity: int = 2) -> Section:
+    return Section(subject, 0, TIME_BLOCKS[block], capacity=capacity)
+
+
+def test_augment_moves_through_a_full_sibling():
+    # Math sections in blocks 0, 1 and 2; the one in block 1 is full
+    a, b, c = placed("math", 0), placed("math", 1), placed("math", 2)
+    mover, b1, b2 = Student("Mover", {"math": 1}), Student("B1", {"math": 1}), Student("B2", {"math": 1})
+    enroll(a, mover)
+    enroll(b, b1, b2)
+    # Mover clashes in block 0 and can't take block 2 either, so only b is free for them.
+    # Nobody in b can take the seat mover leaves in block 0, and only b1 can go to block 2
+    enroll(placed("english", 0), mover, b1)
+    enroll(placed("english", 0), b2)
+    enroll(placed("asl", 2), mover)
+    enroll(placed("asl", 2), b2)
+
+    assert _augment(mover, a, {0: [a], 1: [b], 2: [c]}, 2, MODEL)
+
+    assert a.get_students() == []
+    assert set(b.get_students()) == {mover, b2}
+    assert c.get_students() == [b1]
+    assert b in mover.get_schedule() and a not in mover.get_schedule()
+    assert c in b1.get_schedule() and b not in b1.get_schedule()
+
+
+def test_augment_fails_without_a_free_seat():
+    a, b = placed("math", 0), placed("math", 1)
+    mover, b1, b2 = Student("Mover", {"math": 1}), Student("B1", {"math": 1}), Student("B2", {"math": 1})
+    enroll(a, mover)
+    enroll(b, b1, b2)
+    enroll(placed("english", 0), mover, b1)
+    enroll(placed("english", 0), b2)
+
+    assert not _augment(mover, a, {0: [a], 1: [b]}, 2, MODEL)
+    assert a.get_students() == [mover]
+    assert set(b.get_students()) == {b1, b2}
+
+
+def test_least_conflicting_block_never_double_books_the_teacher():
+    teacher = Teacher({"math": 1}, 6, "Teach")
+    section = Section("math", 0, capacity=30)
+    section.set_teacher(teacher)
+    students = [Student(f"S{i}", {"math": 1}) for i in range(30)]
+    enroll(section, *students)
+
+    # Same teacher in block 0, a class sharing all 30 students in block 1
+    same_teacher = placed("math", 0, 30)
+    same_teacher.set_teacher(teacher)
+    shared_students = placed("english", 1, 30)
+    enroll(shared_students, *students)
+
+    block = _least_conflicting_block(section, {same_teacher, shared_students}, TIME_BLOCKS[:2], MODEL)
+    assert block == TIME_BLOCKS[1]
+
+
+def test_check_for_conflicts_reports_broken_hard_limits():
+    teacher = Teacher({"math": 1}, 6, "Teach", max_consecutive=1)
+    # Blocks 0 and 1 are back to back, three sections share block 0's two rooms
+    first, second = placed("math", 0), placed("math", 1)
+    crowded = [first, placed("english", 0), placed("asl", 0), second]
+    for section in (first, second):
+        section.set_teacher(teacher)
+        teacher.add_section(section)
+
+    issues = check_for_conflicts([], [teacher], TIME_BLOCKS, crowded, block_capacity=2)
+    assert issues == [
+        f"Back-to-back: {teacher} is over their limit of 1 in a row",
+        f"Room shortage: 3 sections at {TIME_BLOCKS[0]} for 2 rooms",
+    ]
+    assert check_for_conflicts([], [teacher], TIME_BLOCKS) == issues[:1]
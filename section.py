@@ -1,8 +1,7 @@
 from typing import TYPE_CHECKING
-from time_block import TimeBlock
+from time_block import TimeBlock, time_model
 from constants import CLASS_LIMIT
 import uuid
-import pandas as pd
 from constants import TIME_BLOCKS
 
 if TYPE_CHECKING:
@@ -13,21 +12,20 @@ class Section:
     Creates a section of a class that students will take
     Name: Name of the Class, could be seperated into 'name, difficulty'
     Time: Time block of the class
-    Days: Days of the week the class is held in the format: "MTWRF"
     Capacity: How many students can take the class
     """
-    def __init__(self, subject: str, level: int, time: TimeBlock | None = None, days:str | None = None, teacher: 'Teacher' = None):
+    def __init__(self, subject: str, level: int, time: TimeBlock | None = None, teacher: 'Teacher' = None, capacity: int = CLASS_LIMIT):
         self.__id = uuid.uuid4()
         self.__subject = subject
         self.__time = time
         self.__level = level
         self.__teacher = teacher
-        self.__days = days
         self.__students = []
+        self.__capacity = capacity
 
     # Checks if the classs is at capacity
     def is_full(self):
-        if len(self.__students) == CLASS_LIMIT:
+        if len(self.__students) == self.__capacity:
             return True
         else:
             return False
@@ -54,7 +52,7 @@ class Section:
     def set_teacher(self,teacher):
         if teacher.is_full():
             raise IndexError("Teacher's schedule is full.")
-        elif teacher.subjects[self.__subject.lower()] == -1:
+        elif teacher.subjects.get(self.__subject.lower(), -1) == -1:
             raise ValueError(f"Teacher {teacher.name} is not qualified to teach {self.__subject}.")
         else:
             self.__teacher = teacher
@@ -63,10 +61,8 @@ class Section:
         self.__time = time
     
     def get_days(self):
-        return self.__days
-    
-    def set_days(self, days: str):
-        self.__days = days
+        # A section meets on its time block's days
+        return self.__time.days if self.__time is not None else None
     
     def get_teacher(self):
         return self.__teacher
@@ -82,6 +78,9 @@ class Section:
     
     def get_id(self):
         return self.__id
+
+    def set_id(self, id: uuid.UUID):
+        self.__id = id
     
     def __str__(self):
         return f"Section({self.__subject}, {self.__time}, {self.__level}, {self.__teacher})"
@@ -89,29 +88,17 @@ class Section:
     def __repr__(self):
         return self.__str__()
     
-    def to_json(self) -> dict:
+    def to_json(self, time_blocks: list[TimeBlock] = TIME_BLOCKS) -> dict:
         return {
             "id": str(self.__id),
             "subject": self.__subject,
             "level": self.__level,
-            "timeBlockId": TIME_BLOCKS.index(self.__time) if self.__time else None,
-            "days": self.__days,
+            "timeBlockId": time_model(time_blocks).id_of(self.__time),
+            "days": self.get_days(),
             "teacherId": str(self.__teacher.id) if self.__teacher else None,
             "studentIds": [str(student.id) for student in self.__students]
         }
         
 def export_sections_to_csv(sections: list[Section], file_name: str) -> None:
-    import pandas as pd
-    data = []
-    for section in sections:
-        data.append({
-            "Subject": section.get_subject(),
-            "Level": section.get_level(),
-            "Time": str(section.get_time()),
-            "Days": section.get_days(),
-            "Teacher": section.get_teacher().name if section.get_teacher() else "Unassigned",
-            "Students": " | ".join([str(student) for student in section.get_students()])
-        })
-    df = pd.DataFrame(data)
-    df.to_csv(file_name, index=False)
-    
\ No newline at end of file
+    from export import export_sections_csv
+    export_sections_csv(sections, file_name)
@@ -0,0 +1,230 @@
+"""
+Immutable, versioned copies of a finished schedule.
+
+A snapshot is taken every time the scheduler publishes a result, so
+background work (exports, diffs, persistence) can read a consistent
+schedule while the live Section/Student/Teacher objects keep changing.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from itertools import chain
+
+from constants import TIME_BLOCKS
+from diff import diff_snapshots
+from export import atomic_open, section_csv_rows, student_schedule_csv_rows
+from scheduler import count_clashes
+from section import Section
+from student import Student
+from teacher import Teacher
+from time_block import TimeBlock, time_model
+
+
+@dataclass(frozen=True)
+class ScheduleSnapshot:
+    version: int
+    sections: tuple[dict, ...]
+    teachers: tuple[dict, ...]
+    students: tuple[dict, ...]
+    conflicts: tuple[str, ...]
+    section_rows: tuple[tuple, ...]
+    schedule_rows: tuple[tuple, ...]
+    created: float = field(default_factory=time.time)
+    time_blocks: tuple[dict, ...] = ()
+    # Sequence number of the last logged edit (see editlog.py) included
+    edit_seq: int = 0
+
+
+def take_snapshot(version: int,
+                  sections: list[Section],
+                  teachers: list[Teacher],
+                  students: list[Student],
+                  conflicts: list[str],
+                  time_blocks: list[TimeBlock] = TIME_BLOCKS,
+                  edit_seq: int = 0) -> ScheduleSnapshot:
+    return SnapshotBuilder(sections, teachers, students, conflicts, time_blocks).build(version, edit_seq)
+
+
+class SnapshotBuilder:
+    """
+    The rendered pieces of a schedule (each section's, teacher's and
+    student's JSON record and CSV rows, and their conflicts), kept so that
+    after a manual edit only what it touched is re-rendered. Publishing a
+    version is then a few tuple copies instead of rendering every record.
+
+        builder = SnapshotBuilder(sections, teachers, students, issues)
+        builder.touch(sections=[section], students=[student])
+        snapshot = builder.build(version + 1, edit_seq)
+
+    Sections are fixed for the builder's lifetime; students and teachers it
+    hasn't seen yet (e.g. added by a bulk upload) are added when touched.
+    """
+    def __init__(self,
+                 sections: list[Section],
+                 teachers: list[Teacher],
+                 students: list[Student],
+                 issues: list[str],
+                 time_blocks: list[TimeBlock] = TIME_BLOCKS):
+        self.time_blocks = list(time_blocks)
+        self.model = time_model(self.time_blocks)
+        self._section_index = {id(s): i for i, s in enumerate(sections)}
+        self._section_records = [s.to_json(time_blocks) for s in sections]
+        self._section_rows = [tuple(r) for r in section_csv_rows(sections)]
+        self._teachers = list(teachers)
+        self._teacher_index = {id(t): i for i, t in enumerate(teachers)}
+        self._teacher_records = [t.to_json() for t in teachers]
+        self._students = list(students)
+        self._student_index = {id(s): i for i, s in enumerate(students)}
+        self._student_records = [s.to_json() for s in students]
+        self._schedule_rows = [tuple(map(tuple, student_schedule_csv_rows([s]))) for s in students]
+        self._issues = list(issues)
+        # Per-person conflicts, only worked out on the first touch; until
+        # then `issues` (from the run that built the schedule) is current
+        self._student_conflicts: dict[int, int] | None = None
+        self._teacher_conflicts: dict[int, int] = {}
+
+    def _slot(self, person, index: dict, people: list, records: list) -> int:
+        i = index.get(id(person))
+        if i is None:
+            i = index[id(person)] = len(people)
+            people.append(person)
+            records.append(None)
+            if people is self._students:
+                self._schedule_rows.append(())
+        return i
+
+    def _count_conflicts(self) -> None:
+        self._student_conflicts = {}
+        for i, student in enumerate(self._students):
+            self._set_count(self._student_conflicts, i, count_clashes(student.get_schedule(), self.model))
+        for i, teacher in enumerate(self._teachers):
+            self._set_count(self._teacher_conflicts, i, count_clashes(teacher.schedule, self.model))
+        # Keep the run's overflow and feasibility issues, the conflicts are counted here from now on
+        self._issues = [i for i in self._issues if not i.startswith(("Student conflict:", "Teacher conflict:"))]
+
+    @staticmethod
+    def _set_count(counts: dict[int, int], i: int, count: int) -> None:
+        if count:
+            counts[i] = count
+        else:
+            counts.pop(i, None)
+
+    def touch(self,
+              sections: list[Section] = (),
+              teachers: list[Teacher] = (),
+              students: list[Student] = ()) -> None:
+        """Re-renders the given records after their schedules changed."""
+        if self._student_conflicts is None:
+            self._count_conflicts()
+        for section in sections:
+            i = self._section_index[id(section)]
+            self._section_records[i] = section.to_json(self.time_blocks)
+            self._section_rows[i] = tuple(next(section_csv_rows([section])))
+        for teacher in teachers:
+            i = self._slot(teacher, self._teacher_index, self._teachers, self._teacher_records)
+            self._teacher_records[i] = teacher.to_json()
+            self._set_count(self._teacher_conflicts, i, count_clashes(teacher.schedule, self.model))
+        for student in students:
+            i = self._slot(student, self._student_index, self._students, self._student_records)
+            self._student_records[i] = student.to_json()
+            self._schedule_rows[i] = tuple(map(tuple, student_schedule_csv_rows([student])))
+            self._set_count(self._student_conflicts, i, count_clashes(student.get_schedule(), self.model))
+
+    def issues(self) -> list[str]:
+        if self._student_conflicts is None:
+            return list(self._issues)
+        return (
+            self._issues
+            + [f"Student conflict: {self._students[i]}" for i in sorted(self._student_conflicts) for _ in range(self._student_conflicts[i])]
+            + [f"Teacher conflict: {self._teachers[i]}" for i in sorted(self._teacher_conflicts) for _ in range(self._teacher_conflicts[i])]
+        )
+
+    def build(self, version: int, edit_seq: int = 0) -> ScheduleSnapshot:
+        return ScheduleSnapshot(
+            version=version,
+            sections=tuple(self._section_records),
+            teachers=tuple(self._teacher_records),
+            students=tuple(self._student_records),
+            conflicts=tuple(self.issues()),
+            section_rows=tuple(self._section_rows),
+            schedule_rows=tuple(chain.from_iterable(self._schedule_rows)),
+            time_blocks=tuple(b.to_json(i) for i, b in enumerate(self.time_blocks)),
+            edit_seq=edit_seq,
+        )
+
+
+def save_snapshot(snapshot: ScheduleSnapshot, path: str) -> None:
+    """Persists a snapshot as JSON, atomically replacing any previous file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with atomic_open(path, "w") as f:
+        json.dump(asdict(snapshot), f, separators=(",", ":"))
+        # The edit log is compacted once this returns, so it must be on disk
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def load_snapshot(path: str) -> ScheduleSnapshot | None:
+    """Loads a snapshot written by save_snapshot, or None if there is none."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    return ScheduleSnapshot(
+        version=data["version"],
+        sections=tuple(data["sections"]),
+        teachers=tuple(data["teachers"]),
+        students=tuple(data["students"]),
+        conflicts=tuple(data["conflicts"]),
+        section_rows=tuple(tuple(r) for r in data["section_rows"]),
+        schedule_rows=tuple(tuple(r) for r in data["schedule_rows"]),
+        created=data["created"],
+        time_blocks=tuple(data.get("time_blocks", ())),
+        edit_seq=data.get("edit_seq", 0),
+    )
+
+
+class SnapshotHistory:
+    """
+    The last `size` published snapshots, so clients can ask for what
+    changed since the version they hold. Diffs are cached per
+    (from, to) pair since every client polling the same version asks
+    for the same one.
+    """
+    def __init__(self, size: int = 10, cached_diffs: int = 32):
+        self.size = size
+        self.cached_diffs = cached_diffs
+        self._snapshots: OrderedDict[int, ScheduleSnapshot] = OrderedDict()
+        self._diffs: OrderedDict[tuple[int, int], dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, snapshot: ScheduleSnapshot) -> None:
+        with self._lock:
+            self._snapshots[snapshot.version] = snapshot
+            while len(self._snapshots) > self.size:
+                self._snapshots.popitem(last=False)
+
+    def get(self, version: int) -> ScheduleSnapshot | None:
+        return self._snapshots.get(version)
+
+    def diff(self, since: int, current: ScheduleSnapshot) -> dict | None:
+        """Changes from version `since` to `current`, or None if `since` is no longer kept."""
+        key = (since, current.version)
+        with self._lock:
+            if key in self._diffs:
+                self._diffs.move_to_end(key)
+                return self._diffs[key]
+            old = self._snapshots.get(since)
+        if old is None:
+            return None
+
+        changes = diff_snapshots(old, current)
+        with self._lock:
+            self._diffs[key] = changes
+            while len(self._diffs) > self.cached_diffs:
+                self._diffs.popitem(last=False)
+        return changes
@@ -1,11 +1,52 @@
 from section import Section
+from constants import ID_NAMESPACE, SUBJECT_ALIASES, get_levels
+import numpy as np
 import uuid
 
+
+class ScoreTable:
+    """
+    Scores of a group of students as a dense subjects x students array,
+    with the matching levels computed once for the whole table. Students
+    loaded together share one table and point at their column in it.
+    """
+    def __init__(self, subjects: list[str], scores):
+        self.subjects = list(subjects)
+        self.rows = {subject: i for i, subject in enumerate(self.subjects)}
+        if self.subjects:
+            self.scores = np.array(scores, dtype=np.int16).reshape(len(self.subjects), -1)
+        else:
+            self.scores = np.zeros((0, 1), dtype=np.int16)
+        self.levels = get_levels(self.scores)
+
+
 class Student:
-    def __init__(self, name, english, math, asl):
-        self.id = uuid.uuid4()
+    def __init__(
+        self,
+        name,
+        subject_rankings: dict | None = None,
+        table: ScoreTable | None = None,
+        column: int = 0,
+        occurrence: int = 0,
+        external_id: str | None = None
+    ):
+        """
+        Either pass the student's scores as {subject: score}, or the
+        ScoreTable column they already live in. The id is derived from the
+        caller's `external_id` when there is one, otherwise from the name,
+        with `occurrence` telling apart students sharing a name.
+        """
+        if external_id is not None:
+            self.id = external_student_id(external_id)
+        else:
+            self.id = uuid.uuid5(ID_NAMESPACE, f"student:{name}:{occurrence}")
+        self.external_id = external_id
         self.name = name
-        self.subject_rankings = {"math": math, "english": english, "asl": asl}
+        if table is None:
+            rankings = subject_rankings or {}
+            table = ScoreTable(list(rankings), [[score] for score in rankings.values()])
+        self.table = table
+        self.column = column
         self.schedule = []
 
     def is_full(self) -> bool:
@@ -13,23 +54,22 @@ class Student:
         Checks if the student's schedule is full.
         """
         return len(self.schedule) >= 6
-    
+
+    @property
+    def subject_rankings(self) -> dict:
+        return {subject: int(self.table.scores[i, self.column]) for subject, i in self.table.rows.items()}
+
     def get_subject_rankings(self) -> dict:
         """Returns the student's subject rankings"""
         return self.subject_rankings
 
-    def get_english_level(self) -> int:
-        """Returns the student's English level"""
-        return 0 if self.subject_rankings["english"] <= 3 else 2 if self.subject_rankings["english"] > 6 else 1
-    
-    def get_math_level(self) -> int:
-        """Returns the student's Math level"""
-        return 0 if self.subject_rankings["math"] <= 3 else 2 if self.subject_rankings["math"] > 6 else 1
-    
-    def get_asl_level(self) -> int:
-        """Returns the student's ASL level"""
-        return 0 if self.subject_rankings["asl"] <= 3 else 2 if self.subject_rankings["asl"] > 6 else 1
-    
+    def get_subjects(self) -> list[str]:
+        return self.table.subjects
+
+    def get_level(self, subject: str) -> int:
+        """Returns the student's level in a subject"""
+        return int(self.table.levels[self.table.rows[subject], self.column])
+
     def add_section(self, course: Section):
         """Adds a class to the student's schedule"""
         # Check if the course is already in the schedule
@@ -49,12 +89,13 @@ class Student:
     def __str__(self):
         return f"{self.name}"
     
+    # By id: students sharing a name and scores are still different students
     def __hash__(self):
-        return hash((self.name, self.english, self.math, self.asl))
+        return hash(self.id)
     
     def __eq__(self, other):
         if isinstance(other, Student):
-            return self.name == other.name and self.english == other.english and self.math == other.math and self.asl == other.asl
+            return self.id == other.id
         return False
     
     def __repr__(self):
@@ -65,37 +106,53 @@ class Student:
             "id": str(self.id),
             "name": self.name,
             "subject_rankings": self.subject_rankings,
-            "sectionIds": [str(section.get_id()) for section in self.schedule]
+            "sectionIds": [str(section.get_id()) for section in self.schedule],
+            "externalId": self.external_id
         }
-    
+
+
+def external_student_id(external_id: str) -> uuid.UUID:
+    """The id of the student a caller knows as `external_id`."""
+    return uuid.uuid5(ID_NAMESPACE, f"student:external:{external_id}")
+
+
+def subject_from_header(header: str) -> str:
+    """Turns a CSV header like 'Reading Ability Level' into a subject name ('english')."""
+    name = header.strip().lower()
+    if name.endswith(" ability level"):
+        name = name[:-len(" ability level")]
+    return SUBJECT_ALIASES.get(name, name)
+
+
 def load_student_csv(file_name) -> list[Student]:
     """
     CSV Format: 
-    Name, English, Math, ASL
+    Name, <Subject> Ability Level, <Subject> Ability Level, ...
+
+    Every column after the name is a subject, so adding a subject only
+    takes a new column. Empty scores count as 0.
     """
     with open(file_name, 'r') as file:
-        data = file.readlines()
-    data = [line.strip().split(',') for line in data]
+        data = [line.strip().split(',') for line in file if line.strip()]
+    if not data:
+        return []
+
+    subjects = [subject_from_header(header) for header in data[0][1:]]
+    rows = data[1:]
+    scores = np.zeros((len(subjects), len(rows)), dtype=np.int16)
+    names = []
+
+    for j, line in enumerate(rows):
+        names.append(line[0] or 'Unknown')
+        for i, value in enumerate(line[1:len(subjects) + 1]):
+            scores[i, j] = int(value) if value else 0
+
+    table = ScoreTable(subjects, scores)
+    seen = {}
     students = []
-    
-    for i, line in enumerate(data):
-        if i == 0:
-            continue
-        if line[0] == '':
-            line[0] = 'Unknown'
-        if line[1] == '':
-            line[1] = 0
-        if line[2] == '':
-            line[2] = 0
-        if line[3] == '':
-            line[3] = 0
-        
-        name = line[0]
-        english = int(line[1])
-        math = int(line[2])
-        asl = int(line[3])
-        students.append(Student(name, english, math, asl))
-    
+    for j, name in enumerate(names):
+        seen[name] = seen.get(name, -1) + 1
+        students.append(Student(name, table=table, column=j, occurrence=seen[name]))
     return students
 
 if __name__ == "__main__":
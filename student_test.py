@@ -0,0 +1,21 @@
+from section import Section
+from student import load_student_csv
+
+
+def test_duplicate_students_are_distinct(tmp_path):
+    roster = tmp_path / "students.csv"
+    roster.write_text("Name,Math Ability Level\n,\n,\n")
+    first, second = load_student_csv(roster)
+    assert first.name == second.name == "Unknown"
+    assert first != second and first.id != second.id
+
+    section = Section("math", 0)
+    for student in (first, second):
+        section.add_student(student)
+        student.add_section(section)
+    section.remove_student(second)
+    second.remove_section(section)
+
+    assert section.get_students() == [first]
+    assert first.get_schedule() == [section]
+    assert second.get_schedule() == []
@@ -1,14 +1,17 @@
 import uuid
 import pandas as pd
 from section import Section
+from constants import ID_NAMESPACE, MAX_CONSECUTIVE
 
 class Teacher:
-    def __init__(self, subjects_rankings: dict, sections: int, name: str, is_mentor=False):
-        self.id = uuid.uuid4()
+    def __init__(self, subjects_rankings: dict, sections: int, name: str, is_mentor=False, max_consecutive: int = MAX_CONSECUTIVE):
+        # Derived from the name so the same roster gets the same ids every run
+        self.id = uuid.uuid5(ID_NAMESPACE, f"teacher:{name}")
         self.name = name
         self.subjects = subjects_rankings
         self.sections = int(sections)
         self.is_mentor = is_mentor
+        self.max_consecutive = int(max_consecutive)
         self.schedule = []
     
     def is_full(self):
@@ -23,7 +26,7 @@ class Teacher:
         """
         if self.is_full():
             raise IndexError("Teacher's schedule is full.")
-        elif self.subjects[section.get_subject().lower()] == -1:
+        elif self.subjects.get(section.get_subject().lower(), -1) == -1:
             raise ValueError(f"Teacher {self.name} is not qualified to teach {section.get_subject()}.")
         else:
             self.schedule.append(section)
@@ -62,6 +65,11 @@ def load_teachers_csv(file_name) -> list[Teacher]:
     Jeanne,ASL,-1
     Jeanne,Engli8sh,1
     Jeanne,Math,0
+
+    An optional Sections column sets the teacher's section cap
+    (defaults to 6 when the column is missing), and an optional
+    MaxConsecutive column how many blocks they teach back to back
+    (defaults to MAX_CONSECUTIVE).
     """
     teachers = []
     df = pd.read_csv(file_name)
@@ -72,8 +80,13 @@ def load_teachers_csv(file_name) -> list[Teacher]:
         for _, row in group.iterrows():
             subjects_rankings[row['Class'].lower()] = int(row['Weight'])
         sections = 6 # default to 6 sections per teacher
+        if 'Sections' in group.columns:
+            sections = int(group['Sections'].iloc[0])
+        max_consecutive = MAX_CONSECUTIVE
+        if 'MaxConsecutive' in group.columns:
+            max_consecutive = int(group['MaxConsecutive'].iloc[0])
         is_mentor = False # default to false while we don't have that data
-        teacher = Teacher(subjects_rankings, sections, name, is_mentor)
+        teacher = Teacher(subjects_rankings, sections, name, is_mentor, max_consecutive)
         teachers.append(teacher)
     return teachers
 
@@ -0,0 +1,224 @@
+"""
+Per-tenant (per-school) scheduling state.
+
+Each tenant lives in its own directory under TenantRegistry.root:
+
+    <root>/<tenant id>/config.json     class limit, time blocks and rooms per block
+    <root>/<tenant id>/students.csv    roster, same format as data/students.csv
+    <root>/<tenant id>/teachers.csv    same format as teachers.csv
+    <root>/<tenant id>/snapshot.json   last published schedule
+
+Only recently used tenants are kept in memory. When the estimated size
+of the loaded tenants exceeds the registry's memory budget, the least
+recently used ones are evicted; their snapshot is loaded again from
+disk on the next request, and their roster only when they are
+rescheduled.
+"""
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from constants import CLASS_LIMIT, TIME_BLOCKS
+from export import atomic_open
+from scheduler import run_pipeline
+from section import Section
+from snapshot import ScheduleSnapshot, load_snapshot, save_snapshot, take_snapshot
+from student import Student, load_student_csv
+from teacher import Teacher, load_teachers_csv
+from time_block import WEEKDAYS, TimeBlock
+
+TENANT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Rough in-memory cost of one loaded entity (live object, snapshot record
+# and CSV rows together), used to enforce the memory budget
+STUDENT_BYTES = 2_000
+TEACHER_BYTES = 1_500
+SECTION_BYTES = 1_500
+
+
+@dataclass
+class TenantConfig:
+    class_limit: int = CLASS_LIMIT
+    time_blocks: list[TimeBlock] = field(default_factory=lambda: list(TIME_BLOCKS))
+    block_capacity: int | None = None
+
+    def to_json(self) -> dict:
+        return {
+            "class_limit": self.class_limit,
+            "time_blocks": [b.to_json(i) for i, b in enumerate(self.time_blocks)],
+            "block_capacity": self.block_capacity
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "TenantConfig":
+        config = cls()
+        if "class_limit" in data:
+            config.class_limit = int(data["class_limit"])
+        if "time_blocks" in data:
+            config.time_blocks = [
+                TimeBlock(int(b["start"]), int(b["end"]), b.get("days", WEEKDAYS)) for b in data["time_blocks"]
+            ]
+        if data.get("block_capacity") is not None:
+            config.block_capacity = int(data["block_capacity"])
+        if config.class_limit < 1 or not config.time_blocks:
+            raise ValueError("class_limit must be positive and time_blocks must not be empty")
+        if config.block_capacity is not None and config.block_capacity < 1:
+            raise ValueError("block_capacity must be positive")
+        return config
+
+
+class Tenant:
+    def __init__(self, tenant_id: str, directory: str, config: TenantConfig):
+        self.id = tenant_id
+        self.directory = directory
+        self.config = config
+        self.students: dict[str, Student] = {}
+        self.teachers: dict[str, Teacher] = {}
+        self.sections: dict[str, Section] = {}
+        self.snapshot: ScheduleSnapshot | None = None
+        self.lock = threading.Lock()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def load_snapshot(self) -> None:
+        self.snapshot = load_snapshot(self.path("snapshot.json"))
+
+    def load_roster(self) -> None:
+        """Loads students and teachers from the tenant's CSV files."""
+        self.students = {str(s.id): s for s in load_student_csv(self.path("students.csv"))}
+        self.teachers = {str(t.id): t for t in load_teachers_csv(self.path("teachers.csv"))}
+        self.sections = {}
+
+    def has_roster(self) -> bool:
+        return os.path.exists(self.path("students.csv")) and os.path.exists(self.path("teachers.csv"))
+
+    def run(self) -> list[str]:
+        """Schedules the tenant's roster and publishes a new snapshot."""
+        with self.lock:
+            if not self.students:
+                self.load_roster()
+
+            sections_list, issues = run_pipeline(
+                list(self.students.values()),
+                list(self.teachers.values()),
+                self.config.class_limit,
+                self.config.time_blocks,
+                block_capacity=self.config.block_capacity,
+                # The process-wide metrics describe the live schedule only
+                record_metrics=False
+            )
+            self.sections = {str(s.get_id()): s for s in sections_list}
+            conflicts = issues.all()
+
+            self.snapshot = take_snapshot(
+                self.snapshot.version + 1 if self.snapshot else 1,
+                sections_list,
+                list(self.teachers.values()),
+                list(self.students.values()),
+                conflicts,
+                self.config.time_blocks
+            )
+            save_snapshot(self.snapshot, self.path("snapshot.json"))
+            return conflicts
+
+    def estimated_bytes(self) -> int:
+        students = max(len(self.students), len(self.snapshot.students) if self.snapshot else 0)
+        teachers = max(len(self.teachers), len(self.snapshot.teachers) if self.snapshot else 0)
+        sections = max(len(self.sections), len(self.snapshot.sections) if self.snapshot else 0)
+        return students * STUDENT_BYTES + teachers * TEACHER_BYTES + sections * SECTION_BYTES
+
+    def evict(self) -> None:
+        """Drops everything that can be reloaded from disk."""
+        self.students = {}
+        self.teachers = {}
+        self.sections = {}
+        self.snapshot = None
+
+
+class TenantRegistry:
+    def __init__(self, root: str = "out/tenants", memory_budget: int = 512 * 1024 * 1024):
+        self.root = root
+        self.memory_budget = memory_budget
+        self._loaded: OrderedDict[str, Tenant] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _directory(self, tenant_id: str) -> str:
+        if not TENANT_ID_PATTERN.match(tenant_id):
+            raise ValueError(f"Invalid tenant id {tenant_id!r}")
+        return os.path.join(self.root, tenant_id)
+
+    def ids(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, "config.json"))
+        )
+
+    def is_loaded(self, tenant_id: str) -> bool:
+        return tenant_id in self._loaded
+
+    def put(self, tenant_id: str, config: TenantConfig) -> Tenant:
+        """Creates a tenant, or replaces an existing tenant's configuration."""
+        directory = self._directory(tenant_id)
+        os.makedirs(directory, exist_ok=True)
+        with atomic_open(os.path.join(directory, "config.json"), "w") as f:
+            json.dump(config.to_json(), f)
+
+        tenant = self.get(tenant_id)
+        tenant.config = config
+        return tenant
+
+    def get(self, tenant_id: str) -> Tenant:
+        """Returns a tenant, loading its snapshot from disk if it was evicted."""
+        directory = self._directory(tenant_id)
+
+        with self._lock:
+            tenant = self._loaded.get(tenant_id)
+            if tenant is not None:
+                self._loaded.move_to_end(tenant_id)
+                return tenant
+
+            try:
+                with open(os.path.join(directory, "config.json")) as f:
+                    config = TenantConfig.from_json(json.load(f))
+            except FileNotFoundError:
+                raise KeyError(tenant_id) from None
+
+            tenant = Tenant(tenant_id, directory, config)
+            tenant.load_snapshot()
+            self._loaded[tenant_id] = tenant
+            self._evict_over_budget()
+            return tenant
+
+    def write_roster_file(self, tenant_id: str, name: str, data: bytes) -> None:
+        """Stores an uploaded students.csv/teachers.csv and drops the stale roster."""
+        tenant = self.get(tenant_id)
+        with atomic_open(tenant.path(name), "wb") as f:
+            f.write(data)
+        with tenant.lock:
+            tenant.students = {}
+            tenant.teachers = {}
+
+    def enforce_budget(self) -> None:
+        """Evicts idle tenants after one of them grew (e.g. after a run)."""
+        with self._lock:
+            self._evict_over_budget()
+
+    def _evict_over_budget(self) -> None:
+        total = sum(t.estimated_bytes() for t in self._loaded.values())
+
+        # Oldest first; the most recently used tenant is never evicted
+        for tenant_id in list(self._loaded)[:-1]:
+            if total <= self.memory_budget:
+                break
+            tenant = self._loaded[tenant_id]
+            if tenant.lock.locked():
+                continue  # busy scheduling
+            total -= tenant.estimated_bytes()
+            tenant.evict()
+            del self._loaded[tenant_id]
@@ -1,18 +1,29 @@
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+WEEKDAYS = "MTWRF"
 
 @dataclass
 class TimeBlock:
     """
     A class to represent a block of time with a start and end time.
-    
-    Times should be in military format without colons. 
+
+    Times should be in military format without colons.
     For example:
         1:30 PM would be represented as 1330.
         8:00 AM would be represented as 800.
+
+    Days is the day pattern the block meets on, e.g. "MWF" or "TR". Two
+    blocks overlap when they share a day and their times intersect.
     """
     start: int
     end: int
-    
+    days: str = WEEKDAYS
+
+    def overlaps(self, other: "TimeBlock") -> bool:
+        """Whether the blocks meet on a common day at overlapping times."""
+        return bool(set(self.days) & set(other.days)) and self.start < other.end and other.start < self.end
+
     def to_json(self, id: int) -> dict:
         """Returns a JSON representation of the TimeBlock
 
@@ -20,16 +31,86 @@ class TimeBlock:
         return {
             "id": id,
             "start": self.start,
-            "end": self.end
+            "end": self.end,
+            "days": self.days
         }
 
     def __eq__(self, other):
         if isinstance(other, TimeBlock):
-            return self.start == other.start and self.end == other.end
+            return self.start == other.start and self.end == other.end and self.days == other.days
         return False
 
     def __str__(self):
-        return "Start: " + str(self.start) + " End: "+ str(self.end)
-    
+        text = "Start: " + str(self.start) + " End: "+ str(self.end)
+        return text if self.days == WEEKDAYS else text + " Days: " + self.days
+
     def __hash__(self):
-        return hash((self.start, self.end))
+        return hash((self.start, self.end, self.days))
+
+
+class TimeModel:
+    """
+    Slot ids and a slot x slot overlap matrix for one list of time blocks.
+
+    Bit j of masks[i] is set when blocks i and j overlap (every block
+    overlaps itself), so "is block i free next to these sections" is an OR
+    of their masks and one bit test. Blocks outside the list fall back to
+    TimeBlock.overlaps.
+    """
+    def __init__(self, time_blocks: list[TimeBlock]):
+        self.blocks = tuple(time_blocks)
+        self.ids = {block: i for i, block in enumerate(self.blocks)}
+        self.masks = [
+            sum(1 << j for j, other in enumerate(self.blocks) if block.overlaps(other))
+            for block in self.blocks
+        ]
+        # i -> ids of every block overlapping block i
+        self.overlapping = [
+            [j for j in range(len(self.blocks)) if mask >> j & 1]
+            for mask in self.masks
+        ]
+
+    @cached_property
+    def max_disjoint(self) -> int:
+        """Most blocks that can be used with no two overlapping, e.g. by one room."""
+        count = len(self.blocks)
+        best = 0
+
+        def search(i: int, used: int, taken: int):
+            nonlocal best
+            if taken + count - i <= best:
+                return
+            if i == count:
+                best = taken
+                return
+            if not used >> i & 1:
+                search(i + 1, used | self.masks[i], taken + 1)
+            search(i + 1, used, taken)
+
+        search(0, 0, 0)
+        return best
+
+    def id_of(self, block: TimeBlock | None) -> int | None:
+        return self.ids.get(block)
+
+    def mask(self, block: TimeBlock | None) -> int:
+        i = self.ids.get(block)
+        return self.masks[i] if i is not None else 0
+
+    def overlap(self, a: TimeBlock | None, b: TimeBlock | None) -> bool:
+        if a is None or b is None:
+            return False
+        i, j = self.ids.get(a), self.ids.get(b)
+        if i is None or j is None:
+            return a.overlaps(b)
+        return self.masks[i] >> j & 1 == 1
+
+
+@lru_cache(maxsize=32)
+def _time_model(time_blocks: tuple[TimeBlock, ...]) -> TimeModel:
+    return TimeModel(time_blocks)
+
+
+def time_model(time_blocks: list[TimeBlock]) -> TimeModel:
+    """The (cached) TimeModel for a list of time blocks."""
+    return _time_model(tuple(time_blocks))